@@ -6,7 +6,7 @@ Provides user authentication and authorization.
 from typing import Annotated, Optional
 import logging
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlmodel import Session
 from supertokens_python.recipe.session.framework.fastapi import verify_session
 from supertokens_python.recipe.session import SessionContainer
@@ -37,6 +37,7 @@ async def get_current_user_id(
 
 
 async def get_current_user(
+    request: Request,
     user_id: Annotated[str, Depends(get_current_user_id)],
     db: Annotated[Session, Depends(get_session)],
 ) -> User:
@@ -44,6 +45,7 @@ async def get_current_user(
     Get the current authenticated user from the database.
 
     Args:
+        request: Incoming request, used to cache the user lookup
         user_id: SuperTokens user ID
         db: Database session
 
@@ -53,7 +55,7 @@ async def get_current_user(
     Raises:
         HTTPException: If user not found
     """
-    auth_service = AuthService(db)
+    auth_service = AuthService(db, request)
     user = auth_service.get_user_by_supertokens_id(user_id)
 
     if not user:
@@ -70,6 +72,7 @@ async def get_current_user(
 
 
 async def get_optional_current_user(
+    request: Request,
     db: Annotated[Session, Depends(get_session)],
     session: Optional[SessionContainer] = Depends(
         verify_session(session_required=False)
@@ -80,6 +83,7 @@ async def get_optional_current_user(
     Useful for endpoints that work with or without authentication.
 
     Args:
+        request: Incoming request, used to cache the user lookup
         db: Database session
         session: Optional SuperTokens session
 
@@ -89,7 +93,7 @@ async def get_optional_current_user(
     if not session:
         return None
 
-    auth_service = AuthService(db)
+    auth_service = AuthService(db, request)
     user = auth_service.get_user_by_supertokens_id(session.get_user_id())
 
     return user if user and user.is_active else None
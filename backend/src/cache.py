@@ -37,6 +37,11 @@ class Cache:
         else:
             logger.info("Using in-memory cache")
 
+    @property
+    def is_shared(self) -> bool:
+        """Whether entries are visible to every worker process, i.e. backed by Redis."""
+        return self._redis_client is not None
+
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         try:
@@ -129,6 +134,10 @@ def watchlist_cache_key(user_id: int, status_filter: Optional[str] = None) -> st
         return f"user:watchlist:{user_id}:status:{status_filter}"
     return f"user:watchlist:{user_id}"
 
-def watchlist_stats_cache_key(user_id: int) -> str:
-    """Generate cache key for watchlist statistics."""
-    return f"user:watchlist:stats:{user_id}"
+def watchlist_stats_cache_key(user_id: int, version: str) -> str:
+    """Generate cache key for one version of a user's watchlist statistics."""
+    return f"user:watchlist:stats:{user_id}:v{version}"
+
+def watchlist_stats_version_key(user_id: int) -> str:
+    """Generate cache key for the current version of a user's watchlist statistics."""
+    return f"user:watchlist:stats:version:{user_id}"
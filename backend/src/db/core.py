@@ -75,10 +75,13 @@ def get_session() -> Generator[Session, None, None]:
     """
     Dependency to get a database session.
 
+    Objects stay loaded after commit; writes that need database-generated
+    values fetch them with RETURNING instead of a follow-up refresh.
+
     Yields:
         Session: SQLModel database session
     """
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 
@@ -131,9 +131,9 @@ def get_db_session() -> Generator[Session, None, None]:
 DatabaseDep = Annotated[Session, Depends(get_session)]
 
 
-def get_auth_service(db: Session = Depends(get_session)) -> AuthService:
-    """Get AuthService instance with database session."""
-    return AuthService(db)
+def get_auth_service(request: Request, db: Session = Depends(get_session)) -> AuthService:
+    """Get AuthService instance with database session and request-scoped user cache."""
+    return AuthService(db, request)
 
 
 def get_user_service(db: Session = Depends(get_session)) -> UserService:
@@ -3,7 +3,7 @@ Custom exception classes and error handling for the API.
 Provides consistent error responses and structured error information.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException, status
 
 
@@ -188,10 +188,18 @@ class UserNotFoundError(NotFoundError):
 class WatchlistItemNotFoundError(NotFoundError):
     """Exception raised when a watchlist item is not found."""
 
-    def __init__(self, item_id: Optional[int] = None, anime_id: Optional[int] = None, user_id: Optional[int] = None):
+    def __init__(
+        self,
+        item_id: Optional[int] = None,
+        anime_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        item_ids: Optional[List[int]] = None
+    ):
         details = {}
         if user_id:
             details["user_id"] = user_id
+        if item_ids:
+            details["item_ids"] = item_ids
 
         if item_id:
             super().__init__("Watchlist item", item_id, details)
@@ -211,6 +219,17 @@ class DuplicateWatchlistItemError(ConflictError):
         )
 
 
+class DuplicateUserError(ConflictError):
+    """Exception raised when a user violates a unique username or email constraint."""
+
+    def __init__(self, field: str):
+        self.field = field
+        super().__init__(
+            f"A user with this {field} already exists",
+            details={"field": field}
+        )
+
+
 class InactiveUserError(AuthorizationError):
     """Exception raised when trying to perform actions on an inactive user account."""
 
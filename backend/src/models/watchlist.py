@@ -38,8 +38,7 @@ class WatchlistItemBase(SQLModel):
 
     anime_id: int = Field(
         description="AniList anime ID",
-        gt=0,
-        index=True
+        gt=0
     )
     anime_title: str = Field(
         min_length=1,
@@ -114,7 +113,8 @@ class WatchlistItem(WatchlistItemBase, table=True):
     """
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    # Lookups by user_id are served by the composite indexes below
+    user_id: int = Field(foreign_key="user.id")
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
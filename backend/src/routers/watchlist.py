@@ -11,7 +11,11 @@ from ..auth import get_current_user
 from ..dependencies import WatchlistServiceDep
 from ..models import User, WatchlistItemCreate
 from ..schemas import (
+    WATCH_STATUS_VALUES,
+    WATCHLIST_ITEMS_ADAPTER,
     WatchlistAddRequest,
+    WatchlistBatchAddRequest,
+    WatchlistBatchAddResponse,
     WatchlistUpdateRequest,
     WatchlistItemResponse,
     WatchlistResponse,
@@ -20,6 +24,9 @@ from ..schemas import (
 
 router = APIRouter(prefix="/watchlist", tags=["watchlist"])
 
+# Upper bound on ids accepted by the list endpoint's ids filter
+MAX_WATCHLIST_ID_FILTER = 100
+
 
 @router.post(
     "", response_model=WatchlistItemResponse, status_code=status.HTTP_201_CREATED
@@ -42,6 +49,32 @@ async def add_to_watchlist(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post(
+    "/batch", response_model=WatchlistBatchAddResponse, status_code=status.HTTP_201_CREATED
+)
+async def batch_add_to_watchlist(
+    batch_data: WatchlistBatchAddRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    watchlist_service: WatchlistServiceDep,
+):
+    """
+    Add several anime to the user's watchlist in one request.
+
+    Anime already on the watchlist are skipped and reported in skipped_count.
+    """
+    try:
+        items_data = [
+            WatchlistItemCreate(**item.model_dump(by_alias=True)) for item in batch_data.items
+        ]
+        created_items = watchlist_service.bulk_add_to_watchlist(current_user, items_data)
+        return WatchlistBatchAddResponse(
+            items=WATCHLIST_ITEMS_ADAPTER.validate_python(created_items, from_attributes=True),
+            skipped_count=len(items_data) - len(created_items),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("", response_model=WatchlistResponse)
 async def get_watchlist(
     current_user: Annotated[User, Depends(get_current_user)],
@@ -49,18 +82,35 @@ async def get_watchlist(
     status: Optional[str] = Query(None, description="Filter by watch status"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
+    ids: Optional[str] = Query(None, description="Comma-separated watchlist item IDs to restrict to"),
 ):
     """
     Get the user's watchlist with optional filtering and pagination.
 
     Returns paginated list of watchlist items with status counts.
     """
+    # The status query parameter shadows fastapi.status here, hence the bare 422s
+    item_ids = None
+    if ids is not None:
+        try:
+            item_ids = [int(item_id) for item_id in ids.split(",")]
+        except ValueError:
+            raise HTTPException(
+                status_code=422,
+                detail="ids must be a comma-separated list of integers",
+            )
+        if len(item_ids) > MAX_WATCHLIST_ID_FILTER:
+            raise HTTPException(
+                status_code=422,
+                detail=f"At most {MAX_WATCHLIST_ID_FILTER} ids can be requested at once",
+            )
+
     result = watchlist_service.get_watchlist(
-        current_user.id, status, skip, limit
+        current_user.id, status, skip, limit, item_ids
     )
 
     # Convert to response format
-    items = [WatchlistItemResponse.model_validate(item, from_attributes=True) for item in result["items"]]
+    items = WATCHLIST_ITEMS_ADAPTER.validate_python(result["items"], from_attributes=True)
 
     return WatchlistResponse(
         items=items,
@@ -145,7 +195,7 @@ async def get_watchlist_item_by_anime_id(
     if not watchlist_item:
         return None
 
-    return WatchlistItemResponse.model_validate(watchlist_item.model_dump())
+    return WatchlistItemResponse.model_validate(watchlist_item, from_attributes=True)
 
 
 @router.post("/bulk", response_model=SuccessResponse)
@@ -160,6 +210,12 @@ async def bulk_update_status(
 
     Updates the status of all specified watchlist items.
     """
+    if new_status not in WATCH_STATUS_VALUES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid watch status: {new_status}",
+        )
+
     try:
         updated_count = watchlist_service.bulk_update_status(current_user.id, item_ids, new_status)
         return SuccessResponse(
@@ -6,9 +6,9 @@ Separate from database models for clean API contracts.
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List, Any, Dict
-from re import match
+import re
 
-from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator, computed_field
+from pydantic import BaseModel, Field, EmailStr, TypeAdapter, field_validator, model_validator, computed_field
 
 
 class WatchStatus(str, Enum):
@@ -20,12 +20,23 @@ class WatchStatus(str, Enum):
     DROPPED = "dropped"
 
 
+# Plain string values for cheap membership checks on untyped input
+WATCH_STATUS_VALUES = frozenset(status.value for status in WatchStatus)
+
+# Validator patterns compiled once at import instead of per call
+_PASSWORD_STRENGTH_PATTERN = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)')
+_USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+_HTTP_PREFIXES = ('http://', 'https://')
+
+
 class ErrorResponse(BaseModel):
     """Standard error response schema."""
 
     detail: str
     error_code: Optional[str] = None
 
+    model_config = {"defer_build": True}
+
 
 class SuccessResponse(BaseModel):
     """Standard success response schema."""
@@ -42,6 +53,8 @@ class PaginationParams(BaseModel):
         default=20, ge=1, le=100, description="Number of items to return"
     )
 
+    model_config = {"defer_build": True}
+
 
 class PaginatedResponse(BaseModel):
     """Paginated response wrapper."""
@@ -51,6 +64,8 @@ class PaginatedResponse(BaseModel):
     skip: int = Field(..., ge=0, description="Number of items skipped")
     limit: int = Field(..., ge=1, description="Number of items per page")
 
+    model_config = {"defer_build": True}
+
     @computed_field
     @property
     def has_next(self) -> bool:
@@ -75,7 +90,7 @@ class UserLoginRequest(BaseModel):
     @classmethod
     def validate_password_strength(cls, v: str) -> str:
         """Validate password strength."""
-        if not match(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)', v):
+        if not _PASSWORD_STRENGTH_PATTERN.match(v):
             raise ValueError('Password must contain at least one lowercase letter, one uppercase letter, and one digit')
         return v
 
@@ -96,7 +111,7 @@ class UserSignupRequest(BaseModel):
     @classmethod
     def validate_username(cls, v: str) -> str:
         """Validate username format."""
-        if not match(r'^[a-zA-Z0-9_-]+$', v):
+        if not _USERNAME_PATTERN.match(v):
             raise ValueError('Username can only contain letters, numbers, underscores, and hyphens')
         return v
 
@@ -104,7 +119,7 @@ class UserSignupRequest(BaseModel):
     @classmethod
     def validate_password_strength(cls, v: str) -> str:
         """Validate password strength."""
-        if not match(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)', v):
+        if not _PASSWORD_STRENGTH_PATTERN.match(v):
             raise ValueError('Password must contain at least one lowercase letter, one uppercase letter, and one digit')
         return v
 
@@ -151,11 +166,13 @@ class AnimeSearchResult(BaseModel):
     genres: List[str] = Field(default_factory=list, description="Anime genres")
     status: Optional[str] = Field(default=None, description="Anime status")
 
+    model_config = {"defer_build": True}
+
     @field_validator('cover_image')
     @classmethod
     def validate_cover_image_url(cls, v: Optional[str]) -> Optional[str]:
         """Validate cover image URL format."""
-        if v and not v.startswith(('http://', 'https://')):
+        if v and not v.startswith(_HTTP_PREFIXES):
             raise ValueError('Cover image must be a valid HTTP/HTTPS URL')
         return v
 
@@ -182,7 +199,7 @@ class WatchlistAddRequest(BaseModel):
     @classmethod
     def validate_anime_picture_url(cls, v: Optional[str]) -> Optional[str]:
         """Validate anime picture URL format."""
-        if v and not v.startswith(('http://', 'https://')):
+        if v and not v.startswith(_HTTP_PREFIXES):
             raise ValueError('Anime picture URL must be a valid HTTP/HTTPS URL')
         return v
 
@@ -194,6 +211,18 @@ class WatchlistAddRequest(BaseModel):
         return self
 
 
+# Upper bound on items accepted by a single batch add request
+MAX_WATCHLIST_BATCH_SIZE = 500
+
+
+class WatchlistBatchAddRequest(BaseModel):
+    """Request to add several anime to watchlist in one call."""
+
+    items: List[WatchlistAddRequest] = Field(
+        ..., min_length=1, max_length=MAX_WATCHLIST_BATCH_SIZE, description="Anime to add"
+    )
+
+
 class WatchlistUpdateRequest(BaseModel):
     """Request to update watchlist item."""
 
@@ -205,7 +234,7 @@ class WatchlistUpdateRequest(BaseModel):
         default=None, alias="anime_score", ge=0.0, le=10.0, description="User rating"
     )
 
-    model_config = {"populate_by_name": True}
+    model_config = {"populate_by_name": True, "defer_build": True}
 
 
 class WatchlistItemResponse(BaseModel):
@@ -236,6 +265,21 @@ class WatchlistItemResponse(BaseModel):
         return (datetime.now() - self.updatedAt.replace(tzinfo=None)).total_seconds() < 86400
 
 
+# Validates a whole page of ORM rows in one pydantic-core call
+WATCHLIST_ITEMS_ADAPTER = TypeAdapter(List[WatchlistItemResponse])
+
+
+class WatchlistBatchAddResponse(BaseModel):
+    """Batch add response schema."""
+
+    items: List[WatchlistItemResponse] = Field(..., description="Newly created watchlist items")
+    skippedCount: int = Field(
+        ..., alias="skipped_count", ge=0, description="Items skipped because the anime was already on the watchlist"
+    )
+
+    model_config = {"populate_by_name": True}
+
+
 class WatchlistResponse(BaseModel):
     """User's watchlist response schema."""
 
@@ -251,5 +295,5 @@ class WatchlistResponse(BaseModel):
         """Calculate the completion rate as a percentage."""
         if self.totalCount == 0:
             return 0.0
-        completed = self.statusCounts.get(WatchStatus.COMPLETED, 0)
+        completed = self.statusCounts.get("completed", 0)
         return round((completed / self.totalCount) * 100, 1)
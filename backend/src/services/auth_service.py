@@ -6,6 +6,7 @@ Handles user creation and management.
 from typing import Optional
 import logging
 
+from fastapi import Request
 from sqlmodel import Session
 from supertokens_python.recipe.emailpassword.asyncio import sign_up, sign_in
 from supertokens_python.recipe.emailpassword.interfaces import (
@@ -13,6 +14,7 @@ from supertokens_python.recipe.emailpassword.interfaces import (
     SignInOkResult,
 )
 
+from ..exceptions import DuplicateUserError
 from ..models import User, UserCreate, UserUpdate
 from .user_service import UserService
 
@@ -66,8 +68,9 @@ class UserCreationError(AuthException):
 class AuthService:
     """Service for handling authentication operations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, request: Optional[Request] = None):
         self.db = db
+        self.request = request
         self.user_service = UserService(db)
 
     async def create_user_from_supertokens(
@@ -88,6 +91,10 @@ class AuthService:
 
         Returns:
             User: Created user object
+
+        Raises:
+            UsernameTakenError: If username is already taken
+            EmailAlreadyRegisteredError: If email is already registered
         """
         user_data = UserCreate(
             supertokens_user_id=supertokens_user_id,
@@ -96,11 +103,28 @@ class AuthService:
             full_name=full_name,
         )
 
-        return self.user_service.create_user(user_data)
+        try:
+            return self.user_service.create_user(user_data)
+        except DuplicateUserError as e:
+            if e.field == "username":
+                raise UsernameTakenError(username)
+            raise EmailAlreadyRegisteredError(email)
 
     def get_user_by_supertokens_id(self, supertokens_user_id: str) -> Optional[User]:
-        """Get user by SuperTokens user ID."""
-        return self.user_service.get_user_by_supertokens_id(supertokens_user_id)
+        """Get user by SuperTokens user ID, reusing lookups made earlier in the same request."""
+        if self.request is None:
+            return self.user_service.get_user_by_supertokens_id(supertokens_user_id)
+
+        user_cache = getattr(self.request.state, "user_cache", None)
+        if user_cache is None:
+            user_cache = self.request.state.user_cache = {}
+
+        user = user_cache.get(supertokens_user_id)
+        if user is None:
+            user = self.user_service.get_user_by_supertokens_id(supertokens_user_id)
+            if user is not None:
+                user_cache[supertokens_user_id] = user
+        return user
 
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
@@ -134,13 +158,15 @@ class AuthService:
             EmailAlreadyRegisteredError: If email is already registered
             UserCreationError: If user creation fails
         """
-        # Check if username is available
-        if not self.is_username_available(username):
+        # Check username and email availability before touching SuperTokens
+        username_available, email_available = self.user_service.check_signup_availability(
+            username, email
+        )
+        if not username_available:
             logger.warning(f"Signup attempt with taken username: {username}")
             raise UsernameTakenError(username)
 
-        # Check if email is already registered in our database
-        if self.get_user_by_email(email):
+        if not email_available:
             logger.warning(f"Signup attempt with existing email: {email}")
             raise EmailAlreadyRegisteredError(email)
 
@@ -158,6 +184,9 @@ class AuthService:
                 )
                 logger.info(f"User signed up successfully: {email}")
                 return user
+            except (UsernameTakenError, EmailAlreadyRegisteredError):
+                logger.warning(f"Signup lost a uniqueness race for {email}")
+                raise
             except Exception as e:
                 logger.error(f"Failed to create user profile for {email}: {str(e)}")
                 raise UserCreationError(email, str(e))
@@ -212,14 +241,8 @@ class AuthService:
         if user:
             return user
 
-        # Try to extract username from email
-        username = email.split('@')[0]
-        if not self.is_username_available(username):
-            # Append numbers until we find an available username
-            counter = 1
-            while not self.is_username_available(f"{username}{counter}"):
-                counter += 1
-            username = f"{username}{counter}"
+        # Derive username from email, appending a number if it is taken
+        username = self.user_service.get_available_username(email.split('@')[0])
 
         try:
             user_data = UserCreate(
@@ -252,8 +275,7 @@ class AuthService:
         Args:
             user: User to deactivate
         """
-        user.deactivate()
-        self.user_service.update_user(user, UserUpdate(is_active=False))
+        self.user_service.deactivate_user(user)
 
     def reactivate_user(self, user: User) -> None:
         """
@@ -262,5 +284,4 @@ class AuthService:
         Args:
             user: User to reactivate
         """
-        user.reactivate()
-        self.user_service.update_user(user, UserUpdate(is_active=True))
+        self.user_service.reactivate_user(user)
@@ -2,13 +2,19 @@
 User service for handling user-related business logic.
 """
 
+from datetime import datetime, UTC
 from typing import Optional
 import logging
+import re
 
+from fastapi import Depends
+from sqlalchemy import Integer, cast, exists, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Session, select
 
 from ..models import User, UserCreate, UserUpdate
-from ..exceptions import UserNotFoundError, InactiveUserError, DatabaseError
+from ..exceptions import UserNotFoundError, InactiveUserError, DatabaseError, DuplicateUserError
 from ..db.core import get_session
 
 logger = logging.getLogger(__name__)
@@ -45,12 +51,20 @@ class UserService:
     def create_user(self, user_data: UserCreate) -> User:
         """Create a new user."""
         try:
-            user = User.model_validate(user_data)
+            # UserCreate is already validated; the table constructor skips revalidation
+            user = User(**user_data.model_dump())
             self.db.add(user)
             self.db.commit()
             self.db.refresh(user)
             logger.info(f"Created user: {user.username}")
             return user
+        except IntegrityError as e:
+            self.db.rollback()
+            field = _duplicate_user_field(e)
+            if field is None:
+                logger.error(f"Failed to create user: {str(e)}")
+                raise DatabaseError(f"Failed to create user: {str(e)}", "create_user")
+            raise DuplicateUserError(field)
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to create user: {str(e)}")
@@ -60,13 +74,16 @@ class UserService:
         """Update user information."""
         try:
             update_dict = update_data.model_dump(exclude_unset=True)
-            for field, value in update_dict.items():
-                setattr(user, field, value)
-
-            self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-            logger.info(f"Updated user: {user.username}")
+            if update_dict:
+                # ORM-enabled UPDATE also syncs the in-session instance, including
+                # updated_at, so the returned user is current without a reload
+                self.db.exec(
+                    update(User)
+                    .where(User.id == user.id)
+                    .values(**update_dict, updated_at=datetime.now(UTC))
+                )
+                self.db.commit()
+            logger.info(f"Updated user {user.id}")
             return user
         except Exception as e:
             self.db.rollback()
@@ -80,24 +97,64 @@ class UserService:
 
     def deactivate_user(self, user: User) -> User:
         """Deactivate a user account."""
+        return self._set_active(user, False, "deactivate")
+
+    def reactivate_user(self, user: User) -> User:
+        """Reactivate a user account."""
+        return self._set_active(user, True, "reactivate")
+
+    def _set_active(self, user: User, is_active: bool, action: str) -> User:
+        """Set a user's active flag with a single UPDATE."""
+        now = datetime.now(UTC)
         try:
-            user.is_active = False
-            self.db.add(user)
+            self.db.exec(
+                update(User)
+                .where(User.id == user.id)
+                .values(is_active=is_active, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
             self.db.commit()
-            self.db.refresh(user)
-            logger.info(f"Deactivated user: {user.username}")
-            return user
         except Exception as e:
             self.db.rollback()
-            logger.error(f"Failed to deactivate user {user.id}: {str(e)}")
-            raise DatabaseError(f"Failed to deactivate user: {str(e)}", "deactivate_user")
+            logger.error(f"Failed to {action} user {user.id}: {str(e)}")
+            raise DatabaseError(f"Failed to {action} user: {str(e)}", f"{action}_user")
+
+        # Mirror the stored values without reloading the row or marking the user dirty
+        set_committed_value(user, "is_active", is_active)
+        set_committed_value(user, "updated_at", now)
+        logger.info(f"{action.capitalize()}d user: {user.username}")
+        return user
 
     def is_username_available(self, username: str, exclude_user_id: Optional[int] = None) -> bool:
         """Check if username is available."""
-        query = select(User).where(User.username == username)
+        condition = User.username == username
         if exclude_user_id:
-            query = query.where(User.id != exclude_user_id)
-        return self.db.exec(query).first() is None
+            condition = condition & (User.id != exclude_user_id)
+        return not self.db.exec(select(exists().where(condition))).one()
+
+    def check_signup_availability(self, username: str, email: str) -> tuple[bool, bool]:
+        """Check username and email availability in a single query."""
+        statement = select(
+            exists().where(User.username == username),
+            exists().where(User.email == email),
+        )
+        username_taken, email_taken = self.db.exec(statement).one()
+        return not username_taken, not email_taken
+
+    def get_available_username(self, base_username: str) -> str:
+        """Get the base username, or the base with one past the highest numbered suffix taken."""
+        # Only base followed by digits can collide, so other usernames sharing the
+        # prefix are never loaded; the digit cap keeps the suffix cast in range
+        numbered = User.username.regexp_match(f"^{re.escape(base_username)}[0-9]{{1,9}}$")
+        suffix = cast(func.substr(User.username, len(base_username) + 1), Integer)
+        statement = select(
+            exists().where(User.username == base_username),
+            select(func.max(suffix)).where(numbered).scalar_subquery(),
+        )
+        base_taken, max_suffix = self.db.exec(statement).one()
+        if not base_taken:
+            return base_username
+        return f"{base_username}{(max_suffix or 0) + 1}"
 
     def get_user_profile_data(self, user: User) -> dict:
         """Get user profile data including computed fields."""
@@ -115,6 +172,17 @@ class UserService:
         }
 
 
-def get_user_service(db: Session = next(get_session())) -> UserService:
+def _duplicate_user_field(error: IntegrityError) -> Optional[str]:
+    """Identify which unique user column an IntegrityError was raised for."""
+    # First line names the unique index on PostgreSQL and MySQL, and the column on SQLite;
+    # other failures on these columns, like NOT NULL, must not read as duplicates
+    message = str(error.orig).splitlines()[0] if error.orig else ""
+    for field in ("username", "email"):
+        if f"ix_user_{field}" in message or f"UNIQUE constraint failed: user.{field}" in message:
+            return field
+    return None
+
+
+def get_user_service(db: Session = Depends(get_session)) -> UserService:
     """Dependency to get UserService instance."""
     return UserService(db)
@@ -2,71 +2,176 @@
 Watchlist service for handling watchlist-related business logic.
 """
 
+from datetime import datetime, UTC
 from typing import List, Optional, Dict, Any
 import logging
+from uuid import uuid4
 
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select, func
 
+from ..cache import get_cache, watchlist_stats_cache_key, watchlist_stats_version_key
 from ..models import User, WatchlistItem, WatchlistItemCreate, WatchlistItemUpdate
 from ..exceptions import WatchlistItemNotFoundError, DuplicateWatchlistItemError, DatabaseError
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement for bulk adds, bounding statement size and memory
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Dialect-specific insert constructs that support ON CONFLICT DO NOTHING
+_CONFLICT_AWARE_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# Seconds status counts stay cached; writes retire them sooner
+STATUS_COUNTS_CACHE_TTL = 60
+
 
 class WatchlistService:
     """Service for watchlist-related operations."""
 
     def __init__(self, db: Session):
         self.db = db
+        self.cache = get_cache()
+
+    def _invalidate_status_counts(self, user_id: int) -> None:
+        """Retire the cached status counts after the user's watchlist changes."""
+        # A fresh version orphans every entry cached under the old one, including
+        # counts a concurrent reader computed before the commit and writes back late
+        if self.cache.is_shared:
+            self._new_status_counts_version(user_id)
+
+    def _new_status_counts_version(self, user_id: int) -> str:
+        """Start a new status counts version for the user and return it."""
+        # Random versions never repeat, so an expired version key can't revive old entries
+        version = uuid4().hex
+        self.cache.set(watchlist_stats_version_key(user_id), version, ttl=STATUS_COUNTS_CACHE_TTL)
+        return version
 
     def add_to_watchlist(self, user: User, item_data: WatchlistItemCreate) -> WatchlistItem:
         """Add an anime to user's watchlist."""
-        # Check if anime already exists in watchlist
-        existing = self.get_watchlist_item_by_anime_id(user.id, item_data.anime_id)
-        if existing:
-            raise DuplicateWatchlistItemError(anime_id=item_data.anime_id)
-
         try:
-            watchlist_item = WatchlistItem(
-                **item_data.model_dump(),
-                user_id=user.id
+            now = datetime.now(UTC)
+            # RETURNING hands back the stored row, so no refresh SELECT is needed
+            statement = (
+                insert(WatchlistItem)
+                .values(**item_data.model_dump(), user_id=user.id, created_at=now, updated_at=now)
+                .returning(WatchlistItem)
             )
-
-            self.db.add(watchlist_item)
+            watchlist_item = self.db.exec(statement).scalar_one()
             self.db.commit()
-            self.db.refresh(watchlist_item)
+            self._invalidate_status_counts(user.id)
             logger.info(f"Added anime {item_data.anime_id} to {user.username}'s watchlist")
             return watchlist_item
+        except IntegrityError as e:
+            self.db.rollback()
+            # The unique (user_id, anime_id) index rejects duplicates without a pre-check SELECT
+            if _is_duplicate_anime_error(e):
+                raise DuplicateWatchlistItemError(anime_id=item_data.anime_id)
+            logger.error(f"Failed to add anime {item_data.anime_id} to watchlist: {str(e)}")
+            raise DatabaseError(f"Failed to add anime to watchlist: {str(e)}", "add_to_watchlist")
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to add anime {item_data.anime_id} to watchlist: {str(e)}")
             raise DatabaseError(f"Failed to add anime to watchlist: {str(e)}", "add_to_watchlist")
 
+    def bulk_add_to_watchlist(
+        self, user: User, items_data: List[WatchlistItemCreate]
+    ) -> List[WatchlistItem]:
+        """Add many anime to user's watchlist, skipping ones already present."""
+        if not items_data:
+            return []
+
+        conflict_insert = _CONFLICT_AWARE_INSERTS.get(self.db.get_bind().dialect.name)
+        now = datetime.now(UTC)
+        rows = [
+            {**item_data.model_dump(), "user_id": user.id, "created_at": now, "updated_at": now}
+            for item_data in items_data
+        ]
+
+        try:
+            if conflict_insert is None:
+                created_items = self._add_new_rows(user.id, rows)
+            else:
+                created_items = []
+                for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                    statement = (
+                        conflict_insert(WatchlistItem)
+                        .values(rows[start:start + BULK_INSERT_CHUNK_SIZE])
+                        .on_conflict_do_nothing(index_elements=["user_id", "anime_id"])
+                        .returning(WatchlistItem)
+                    )
+                    created_items.extend(self.db.exec(statement).scalars().all())
+
+            self.db.commit()
+            self._invalidate_status_counts(user.id)
+            logger.info(f"Bulk added {len(created_items)} of {len(rows)} anime to user {user.id}'s watchlist")
+            return created_items
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to bulk add anime to watchlist: {str(e)}")
+            raise DatabaseError(f"Failed to bulk add anime to watchlist: {str(e)}", "bulk_add_to_watchlist")
+
+    def _add_new_rows(self, user_id: int, rows: List[Dict[str, Any]]) -> List[WatchlistItem]:
+        """Insert the rows whose anime isn't on the watchlist yet, for dialects without ON CONFLICT."""
+        anime_ids = [row["anime_id"] for row in rows]
+        seen = set()
+        for start in range(0, len(anime_ids), BULK_INSERT_CHUNK_SIZE):
+            seen.update(self.db.exec(
+                select(WatchlistItem.anime_id).where(
+                    WatchlistItem.user_id == user_id,
+                    WatchlistItem.anime_id.in_(anime_ids[start:start + BULK_INSERT_CHUNK_SIZE])
+                )
+            ).all())
+
+        new_items = []
+        for row in rows:
+            # Skip repeats within the batch too, as ON CONFLICT DO NOTHING would
+            if row["anime_id"] not in seen:
+                seen.add(row["anime_id"])
+                new_items.append(WatchlistItem(**row))
+        self.db.add_all(new_items)
+        self.db.flush()
+        return new_items
+
     def get_watchlist(
         self,
         user_id: int,
         status: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
+        limit: int = 20,
+        item_ids: Optional[List[int]] = None
     ) -> Dict[str, Any]:
         """Get user's watchlist with pagination and filtering."""
         try:
+            # Status counts double as the total, saving a separate COUNT query
+            status_counts = self.get_watchlist_status_counts(user_id)
+            if status:
+                total_count = status_counts.get(status, 0)
+            else:
+                total_count = sum(status_counts.values())
+
             query = select(WatchlistItem).where(WatchlistItem.user_id == user_id)
 
             if status:
                 query = query.where(WatchlistItem.status == status)
 
-            # Get total count
-            count_query = query.with_only_columns(func.count(WatchlistItem.id))
-            total_count = self.db.exec(count_query).first() or 0
+            if item_ids is not None:
+                query = query.where(WatchlistItem.id.in_(item_ids))
+                # The status aggregate can't see the id filter, so count the subset
+                total_count = self.db.exec(
+                    select(func.count()).select_from(query.subquery())
+                ).one()
 
             # Apply pagination
             query = query.offset(skip).limit(limit)
             items = self.db.exec(query).all()
 
-            # Get status counts
-            status_counts = self.get_watchlist_status_counts(user_id)
-
             return {
                 "items": items,
                 "total_count": total_count,
@@ -101,20 +206,26 @@ class WatchlistService:
         update_data: WatchlistItemUpdate
     ) -> WatchlistItem:
         """Update a watchlist item."""
-        item = self.get_watchlist_item(user_id, item_id)
-        if not item:
-            raise WatchlistItemNotFoundError(user_id=user_id, item_id=item_id)
-
         try:
             update_dict = update_data.model_dump(exclude_unset=True, by_alias=True)
-            for field, value in update_dict.items():
-                setattr(item, field, value)
+            statement = (
+                update(WatchlistItem)
+                .where(WatchlistItem.id == item_id, WatchlistItem.user_id == user_id)
+                .values(**update_dict, updated_at=datetime.now(UTC))
+                .returning(WatchlistItem)
+            )
+            item = self.db.exec(statement).scalar_one_or_none()
+            if not item:
+                self.db.rollback()
+                raise WatchlistItemNotFoundError(user_id=user_id, item_id=item_id)
 
-            self.db.add(item)
             self.db.commit()
-            self.db.refresh(item)
+            if "status" in update_dict:
+                self._invalidate_status_counts(user_id)
             logger.info(f"Updated watchlist item {item_id} for user {user_id}")
             return item
+        except WatchlistItemNotFoundError:
+            raise
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to update watchlist item {item_id}: {str(e)}")
@@ -122,60 +233,101 @@ class WatchlistService:
 
     def remove_from_watchlist(self, user_id: int, item_id: int) -> None:
         """Remove an item from watchlist."""
-        item = self.get_watchlist_item(user_id, item_id)
-        if not item:
-            raise WatchlistItemNotFoundError(user_id=user_id, item_id=item_id)
-
         try:
-            self.db.delete(item)
+            # Deleting by id and owner makes the rowcount the existence check
+            result = self.db.exec(
+                delete(WatchlistItem).where(
+                    WatchlistItem.id == item_id,
+                    WatchlistItem.user_id == user_id
+                )
+            )
+            if not result.rowcount:
+                self.db.rollback()
+                raise WatchlistItemNotFoundError(user_id=user_id, item_id=item_id)
+
             self.db.commit()
+            self._invalidate_status_counts(user_id)
             logger.info(f"Removed watchlist item {item_id} for user {user_id}")
+        except WatchlistItemNotFoundError:
+            raise
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to remove watchlist item {item_id}: {str(e)}")
             raise DatabaseError(f"Failed to remove watchlist item: {str(e)}", "remove_from_watchlist")
 
     def bulk_update_status(self, user_id: int, item_ids: List[int], new_status: str) -> int:
-        """Bulk update status for multiple watchlist items."""
-        items = self.db.exec(
-            select(WatchlistItem).where(
-                WatchlistItem.id.in_(item_ids),
-                WatchlistItem.user_id == user_id
-            )
-        ).all()
-
-        if not items:
-            raise WatchlistItemNotFoundError(user_id=user_id, item_ids=item_ids)
+        """
+        Bulk update status for multiple watchlist items.
 
+        Runs as a single UPDATE without loading the matching rows, so memory
+        use does not grow with the number of item_ids.
+        """
         try:
-            for item in items:
-                item.status = new_status
-                self.db.add(item)
+            result = self.db.exec(
+                update(WatchlistItem)
+                .where(
+                    WatchlistItem.id.in_(item_ids),
+                    WatchlistItem.user_id == user_id
+                )
+                .values(status=new_status, updated_at=datetime.now(UTC))
+                # Sessions don't expire on commit, so patch loaded items in Python
+                .execution_options(synchronize_session="evaluate")
+            )
+            if not result.rowcount:
+                self.db.rollback()
+                raise WatchlistItemNotFoundError(user_id=user_id, item_ids=item_ids)
 
             self.db.commit()
-            logger.info(f"Updated {len(items)} watchlist items to status {new_status}")
-            return len(items)
+            self._invalidate_status_counts(user_id)
+        except WatchlistItemNotFoundError:
+            raise
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to bulk update watchlist items: {str(e)}")
             raise DatabaseError(f"Failed to bulk update watchlist items: {str(e)}", "bulk_update_status")
 
+        logger.info(f"Updated {result.rowcount} watchlist items to status {new_status}")
+        return result.rowcount
+
     def get_watchlist_status_counts(self, user_id: int) -> Dict[str, int]:
-        """Get status counts for user's watchlist."""
+        """Get status counts for user's watchlist, cached briefly per user when Redis is available."""
+        # Counts drive pagination totals, and a per-process memory cache would
+        # miss invalidations made by other workers, so only Redis is trusted
+        if not self.cache.is_shared:
+            return self._count_statuses(user_id)
+
+        # Read the version before querying so a write landing mid-query retires the result
+        version = self.cache.get(watchlist_stats_version_key(user_id)) or self._new_status_counts_version(user_id)
+        cache_key = watchlist_stats_cache_key(user_id, version)
+        cached_counts = self.cache.get(cache_key)
+        if cached_counts is not None:
+            return cached_counts
+
+        status_counts = self._count_statuses(user_id)
+        self.cache.set(cache_key, status_counts, ttl=STATUS_COUNTS_CACHE_TTL)
+        return status_counts
+
+    def _count_statuses(self, user_id: int) -> Dict[str, int]:
+        """Count the user's watchlist items per status in one GROUP BY query."""
         try:
-            items = self.db.exec(
-                select(WatchlistItem).where(WatchlistItem.user_id == user_id)
+            rows = self.db.exec(
+                select(WatchlistItem.status, func.count(WatchlistItem.id))
+                .where(WatchlistItem.user_id == user_id)
+                .group_by(WatchlistItem.status)
             ).all()
-
-            status_counts = {}
-            for item in items:
-                status_counts[item.status] = status_counts.get(item.status, 0) + 1
-
-            return status_counts
         except Exception as e:
             logger.error(f"Failed to get watchlist status counts for user {user_id}: {str(e)}")
             raise DatabaseError(f"Failed to get watchlist status counts: {str(e)}", "get_watchlist_status_counts")
 
+        # Key by the raw string so lookups skip Enum hashing
+        return {status.value: count for status, count in rows}
+
+def _is_duplicate_anime_error(error: IntegrityError) -> bool:
+    """Whether an IntegrityError was raised by the unique (user_id, anime_id) index."""
+    # First line names the index on PostgreSQL and MySQL, and its columns on SQLite
+    message = str(error.orig).splitlines()[0] if error.orig else ""
+    return "ix_watchlist_user_anime" in message or "watchlistitem.user_id, watchlistitem.anime_id" in message
+
 
 def get_watchlist_service(db: Session) -> WatchlistService:
     """Dependency to get WatchlistService instance."""
@@ -3,9 +3,7 @@ Test configuration and fixtures for the OtakuShelf backend tests.
 """
 
 import asyncio
-import os
 import sys
-import tempfile
 from pathlib import Path
 from typing import AsyncGenerator
 
@@ -13,6 +11,7 @@ import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
@@ -23,11 +22,15 @@ sys.path.insert(0, str(backend_path))
 sys.path.insert(0, str(src_path))
 
 # Local imports after path setup
+import src.cache as cache  # noqa: E402
 import src.config as config  # noqa: E402
 import src.db.core as db_core  # noqa: E402
 import src.main as main  # noqa: E402
 import src.models as models  # noqa: E402
 
+# SuperTokens recipe mocks live in their own module to keep this file focused
+pytest_plugins = ["tests.fixtures.supertokens"]
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -37,6 +40,38 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    """Give each test a fresh in-memory cache instead of a shared or Redis one."""
+    monkeypatch.setattr(cache, "REDIS_AVAILABLE", False)
+    monkeypatch.setattr(cache, "_cache_instance", None)
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Treat the in-memory cache as shared across workers, the way Redis is."""
+    monkeypatch.setattr(cache.Cache, "is_shared", property(lambda self: True))
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application, built once at import and shared by every test."""
+    return main.app
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_app(app):
+    """Build the OpenAPI schema once so route and model schemas are compiled up front."""
+    app.openapi()
+
+
+@pytest.fixture(autouse=True)
+def reset_dependency_overrides(app):
+    """Drop any dependency overrides a test installed; they are its only app-level state."""
+    yield
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture
 def test_settings() -> config.Settings:
     """Create test settings."""
@@ -53,72 +88,133 @@ def test_settings() -> config.Settings:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_db():
-    """Create a test database."""
-    # Create a temporary file for the database
-    temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-    temp_db.close()
-    
-    database_url = f"sqlite:///{temp_db.name}"
-    
+    """Create an in-memory test database, with the schema built once per run."""
+    # In-memory databases are private to their process, so each pytest-xdist
+    # worker gets its own without deriving per-worker names.
+    # StaticPool keeps the single in-memory connection shared for the engine's lifetime
     engine = create_engine(
-        database_url,
+        "sqlite://",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
+        echo=False,
     )
-    
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Create all tables
     SQLModel.metadata.create_all(engine)
-    
+
     yield engine
-    
+
     # Cleanup
     engine.dispose()
-    os.unlink(temp_db.name)
 
 
 @pytest.fixture
 def test_session(test_db) -> Session:
-    """Create a test database session."""
-    session = Session(test_db)
+    """Create a test database session rolled back at teardown."""
+    connection = test_db.connect()
+    transaction = connection.begin()
+    # Commits and rollbacks inside the test only touch SAVEPOINTs of the outer transaction
+    # Like get_session, keep committed objects loaded instead of refetching them
+    session = Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )
     yield session
     session.close()
+    transaction.rollback()
+    connection.close()
+
+
+class QueryCounter:
+    """Records SQL statements sent to the test database, ignoring transaction control."""
+
+    _IGNORED_PREFIXES = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT")
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        """Number of statements recorded since the last reset."""
+        return len(self.statements)
+
+    def reset(self) -> None:
+        """Forget previously recorded statements, e.g. those issued by fixtures."""
+        self.statements.clear()
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        """before_cursor_execute listener."""
+        if not statement.lstrip().upper().startswith(self._IGNORED_PREFIXES):
+            self.statements.append(statement)
+
+    def assert_query_count(self, expected_max: int) -> None:
+        """Fail if more than expected_max statements ran since the last reset."""
+        assert self.count <= expected_max, (
+            f"Expected at most {expected_max} queries, got {self.count}:\n"
+            + "\n".join(self.statements)
+        )
 
 
 @pytest.fixture
-def override_get_session(test_session):
+def query_counter(test_db):
+    """Count queries against the test database to pin per-endpoint budgets."""
+    counter = QueryCounter()
+    event.listen(test_db, "before_cursor_execute", counter.record)
+    yield counter
+    event.remove(test_db, "before_cursor_execute", counter.record)
+
+
+@pytest.fixture
+def override_get_session(app, test_session):
     """Override the get_session dependency."""
     def _override_get_session():
         yield test_session
     
-    main.app.dependency_overrides[db_core.get_session] = _override_get_session
-    yield
-    main.app.dependency_overrides.clear()
+    app.dependency_overrides[db_core.get_session] = _override_get_session
 
 
 @pytest.fixture
-def override_settings(test_settings):
+def override_settings(app, test_settings):
     """Override the get_settings dependency."""
     def _override_get_settings():
         return test_settings
     
-    main.app.dependency_overrides[config.get_settings] = _override_get_settings
-    yield
-    main.app.dependency_overrides.clear()
+    app.dependency_overrides[config.get_settings] = _override_get_settings
+
+
+@pytest.fixture(scope="session")
+def shared_client(app) -> TestClient:
+    """Create one test client for the run so its transport is reused across tests."""
+    test_client = TestClient(app)
+    yield test_client
+    test_client.close()
 
 
 @pytest.fixture
-def client(override_get_session, override_settings) -> TestClient:
-    """Create a test client."""
-    return TestClient(main.app)
+def client(shared_client, override_get_session, override_settings) -> TestClient:
+    """Hand out the shared test client with this test's overrides and no cookies."""
+    # Overrides are read per request, so only cookie state needs resetting
+    shared_client.cookies.clear()
+    return shared_client
 
 
 @pytest_asyncio.fixture
-async def async_client(override_get_session, override_settings) -> AsyncGenerator[AsyncClient, None]:
+async def async_client(app, override_get_session, override_settings) -> AsyncGenerator[AsyncClient, None]:
     """Create an async test client."""
     async with AsyncClient(
-        transport=ASGITransport(app=main.app),
+        transport=ASGITransport(app=app),
         base_url="http://test"
     ) as ac:
         yield ac
@@ -137,11 +233,16 @@ def sample_user_data():
 
 @pytest.fixture
 def sample_user(test_session, sample_user_data) -> models.User:
-    """Create a sample user in the test database."""
+    """
+    Create a sample user in the test database.
+
+    Function-scoped on purpose: tests update and deactivate this user, so a
+    shared instance would leak state. The INSERT is cheap in the in-memory
+    database, and no refresh is needed because objects stay loaded after commit.
+    """
     user = models.User(**sample_user_data)
     test_session.add(user)
     test_session.commit()
-    test_session.refresh(user)
     return user
 
 
@@ -167,56 +268,9 @@ def sample_watchlist_item(test_session, sample_user, sample_watchlist_item_data)
     )
     test_session.add(watchlist_item)
     test_session.commit()
-    test_session.refresh(watchlist_item)
     return watchlist_item
 
 
-@pytest.fixture
-def mock_supertokens_signup(mocker):
-    """Mock SuperTokens signup."""
-    from supertokens_python.recipe.emailpassword.interfaces import SignUpOkResult
-    from supertokens_python.types import RecipeUserId
-    
-    # Create a simple mock user object with required attributes
-    mock_user = mocker.MagicMock()
-    mock_user.id = "test-st-user-id-123"
-    mock_user.email = "test@example.com"
-    mock_user.time_joined = 1234567890
-    mock_user.tenant_ids = ["public"]
-    
-    mock_result = mocker.MagicMock(spec=SignUpOkResult)
-    mock_result.user = mock_user
-    mock_result.recipe_user_id = RecipeUserId("test-st-user-id-123")
-    
-    return mocker.patch(
-        "src.services.auth_service.sign_up",
-        return_value=mock_result
-    )
-
-
-@pytest.fixture
-def mock_supertokens_signin(mocker):
-    """Mock SuperTokens signin."""
-    from supertokens_python.recipe.emailpassword.interfaces import SignInOkResult
-    from supertokens_python.types import RecipeUserId
-    
-    # Create a simple mock user object with required attributes
-    mock_user = mocker.MagicMock()
-    mock_user.id = "test-st-user-id-123"
-    mock_user.email = "test@example.com"
-    mock_user.time_joined = 1234567890
-    mock_user.tenant_ids = ["public"]
-    
-    mock_result = mocker.MagicMock(spec=SignInOkResult)
-    mock_result.user = mock_user
-    mock_result.recipe_user_id = RecipeUserId("test-st-user-id-123")
-    
-    return mocker.patch(
-        "src.services.auth_service.sign_in",
-        return_value=mock_result
-    )
-
-
 @pytest.fixture
 def authenticated_user_headers():
     """Headers for authenticated requests."""
@@ -226,34 +280,42 @@ def authenticated_user_headers():
     }
 
 
-@pytest.fixture
-def mock_get_current_user(sample_user):
-    """Mock the get_current_user dependency."""
+class MockSessionContainer:
+    """Stand-in for a SuperTokens session belonging to the authenticated test user."""
+
+    def __init__(self, authenticated: dict):
+        self._authenticated = authenticated
+
+    def get_user_id(self) -> str:
+        return self._authenticated["user"].supertokens_user_id
+
+
+@pytest.fixture(scope="session")
+def auth_overrides():
+    """
+    Build the auth dependency overrides once for the whole run.
+
+    The overrides read the current user from a shared slot, so each test only
+    has to point the slot at its own user and install the mapping.
+    """
     from src.auth.dependencies import get_current_user, get_current_user_id
     from supertokens_python.recipe.session.framework.fastapi import verify_session
-    
-    # Create a mock session container
-    mock_session = type('MockSession', (), {
-        'get_user_id': lambda: sample_user.supertokens_user_id
-    })()
-    
-    def _verify_session():
-        return mock_session
-    
-    def _get_current_user_id():
-        return sample_user.supertokens_user_id
-    
-    def _get_current_user():
-        return sample_user
-    
-    # Override dependencies in the FastAPI app
-    main.app.dependency_overrides[verify_session] = _verify_session
-    main.app.dependency_overrides[get_current_user_id] = _get_current_user_id
-    main.app.dependency_overrides[get_current_user] = _get_current_user
-    
-    yield sample_user
-    
-    # Clean up overrides
-    for dep in [verify_session, get_current_user_id, get_current_user]:
-        if dep in main.app.dependency_overrides:
-            del main.app.dependency_overrides[dep]
+
+    authenticated = {}
+    mock_session = MockSessionContainer(authenticated)
+    overrides = {
+        verify_session: lambda: mock_session,
+        get_current_user_id: lambda: authenticated["user"].supertokens_user_id,
+        get_current_user: lambda: authenticated["user"],
+    }
+    return authenticated, overrides
+
+
+@pytest.fixture
+def mock_get_current_user(app, auth_overrides, sample_user):
+    """Mock the get_current_user dependency."""
+    authenticated, overrides = auth_overrides
+    authenticated["user"] = sample_user
+    # reset_dependency_overrides removes these again after the test
+    app.dependency_overrides.update(overrides)
+    return sample_user
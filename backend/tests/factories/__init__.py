@@ -1,13 +1,24 @@
 """
 Factory classes for creating test data.
+
+The default factories use cheap deterministic sequences; the Realistic*
+variants draw from Faker for tests that need lifelike data.
 """
 
 import factory
 from faker import Faker
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
 
 from src.models import User, WatchlistItem
+from src.models.watchlist import WatchStatus
+
+# One shared instance: building a Faker loads its locale providers
+fake = Faker("en_US")
+# Seeded once at import so Faker-backed data is reproducible between runs
+fake.seed_instance(0)
 
-fake = Faker()
+WATCH_STATUSES = list(WatchStatus)
 
 
 class UserFactory(factory.Factory):
@@ -16,11 +27,20 @@ class UserFactory(factory.Factory):
     class Meta:
         model = User
     
+    supertokens_user_id = factory.Sequence(lambda n: f"st-user-{n}")
+    username = factory.Sequence(lambda n: f"user{n}")
+    email = factory.Sequence(lambda n: f"user{n}@example.com")
+    full_name = factory.Sequence(lambda n: f"User {n}")
+    is_active = True
+
+
+class RealisticUserFactory(UserFactory):
+    """UserFactory variant with Faker-generated fields."""
+
     supertokens_user_id = factory.LazyFunction(lambda: f"st-user-{fake.uuid4()}")
     username = factory.LazyFunction(lambda: fake.user_name())
     email = factory.LazyFunction(lambda: fake.email())
     full_name = factory.LazyFunction(lambda: fake.name())
-    is_active = True
 
 
 class WatchlistItemFactory(factory.Factory):
@@ -29,11 +49,64 @@ class WatchlistItemFactory(factory.Factory):
     class Meta:
         model = WatchlistItem
     
+    anime_id = factory.Sequence(lambda n: n + 1)
+    anime_title = factory.Sequence(lambda n: f"Anime {n}")
+    anime_picture_url = factory.Sequence(lambda n: f"https://example.com/anime-{n}.jpg")
+    anime_score = factory.Sequence(lambda n: 1.0 + (n % 91) / 10)
+    status = factory.Iterator(WATCH_STATUSES)
+    notes = factory.Sequence(lambda n: f"notes-{n}")
+
+
+class RealisticWatchlistItemFactory(WatchlistItemFactory):
+    """WatchlistItemFactory variant with Faker-generated fields."""
+
     anime_id = factory.LazyFunction(lambda: fake.random_int(min=1, max=999999))
     anime_title = factory.LazyFunction(lambda: fake.catch_phrase())
     anime_picture_url = factory.LazyFunction(lambda: fake.image_url())
     anime_score = factory.LazyFunction(lambda: round(fake.random.uniform(1.0, 10.0), 1))
-    status = factory.LazyFunction(lambda: fake.random_element(elements=[
-        "plan_to_watch", "watching", "completed", "dropped", "on_hold"
-    ]))
+    status = factory.LazyFunction(lambda: fake.random_element(elements=WATCH_STATUSES))
     notes = factory.LazyFunction(lambda: fake.text(max_nb_chars=200))
+
+
+# Insertable columns, leaving out the generated id and computed fields
+_WATCHLIST_COLUMNS = set(WatchlistItem.__table__.columns.keys()) - {"id"}
+
+# Seeded anime ids start above the small hand-picked ids fixtures and tests use
+SEED_ANIME_ID_START = 1_000_000
+
+
+def _next_seed_anime_id(session: Session, user: User) -> int:
+    """Return the first anime_id past both the seed offset and the user's existing rows."""
+    current_max = session.exec(
+        select(func.max(WatchlistItem.anime_id)).where(WatchlistItem.user_id == user.id)
+    ).one()
+    return max(SEED_ANIME_ID_START, current_max or 0) + 1
+
+
+def seed_watchlist_rows(session: Session, user: User, rows: list[dict]) -> None:
+    """Insert rows for user with one multi-row INSERT, filling unset columns from the factory.
+
+    Rows without an anime_id get consecutive ids from a per-call offset rather than
+    the global factory sequence, so they never depend on test order or collide
+    with rows the user already has.
+    """
+    next_anime_id = None
+    values = []
+    for row in rows:
+        if "anime_id" not in row:
+            if next_anime_id is None:
+                next_anime_id = _next_seed_anime_id(session, user)
+            row = {**row, "anime_id": next_anime_id}
+            next_anime_id += 1
+        if "status" in row:
+            # Table models skip validation, so coerce plain strings like the API would
+            row = {**row, "status": WatchStatus(row["status"])}
+        item = WatchlistItemFactory.build(**row)
+        values.append({**item.model_dump(include=_WATCHLIST_COLUMNS), "user_id": user.id})
+    session.exec(insert(WatchlistItem).values(values))
+    session.commit()
+
+
+def seed_watchlist(session: Session, user: User, n: int, **overrides) -> None:
+    """Insert n factory-built watchlist items for user with one multi-row INSERT."""
+    seed_watchlist_rows(session, user, [overrides] * n)
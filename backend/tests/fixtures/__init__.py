@@ -0,0 +1,3 @@
+"""
+Shared pytest fixture modules registered from conftest.py.
+"""
@@ -0,0 +1,66 @@
+"""
+SuperTokens recipe mocks for auth tests.
+
+Registered through pytest_plugins in tests/conftest.py; the recipe types are
+imported inside each fixture so only tests that request them pay for it.
+The recipe functions are patched once per module; the per-test fixtures only
+reset the shared mock and give it a fresh result.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def _supertokens_sign_up_patch(module_mocker):
+    """Patch SuperTokens sign_up for the rest of the module."""
+    return module_mocker.patch("src.services.auth_service.sign_up")
+
+
+@pytest.fixture(scope="module")
+def _supertokens_sign_in_patch(module_mocker):
+    """Patch SuperTokens sign_in for the rest of the module."""
+    return module_mocker.patch("src.services.auth_service.sign_in")
+
+
+@pytest.fixture
+def mock_supertokens_signup(mocker, _supertokens_sign_up_patch):
+    """Mock SuperTokens signup."""
+    from supertokens_python.recipe.emailpassword.interfaces import SignUpOkResult
+    from supertokens_python.types import RecipeUserId
+    
+    # Create a simple mock user object with required attributes
+    mock_user = mocker.MagicMock()
+    mock_user.id = "test-st-user-id-123"
+    mock_user.email = "test@example.com"
+    mock_user.time_joined = 1234567890
+    mock_user.tenant_ids = ["public"]
+    
+    mock_result = mocker.MagicMock(spec=SignUpOkResult)
+    mock_result.user = mock_user
+    mock_result.recipe_user_id = RecipeUserId("test-st-user-id-123")
+    
+    _supertokens_sign_up_patch.reset_mock(return_value=True, side_effect=True)
+    _supertokens_sign_up_patch.return_value = mock_result
+    return _supertokens_sign_up_patch
+
+
+@pytest.fixture
+def mock_supertokens_signin(mocker, _supertokens_sign_in_patch):
+    """Mock SuperTokens signin."""
+    from supertokens_python.recipe.emailpassword.interfaces import SignInOkResult
+    from supertokens_python.types import RecipeUserId
+    
+    # Create a simple mock user object with required attributes
+    mock_user = mocker.MagicMock()
+    mock_user.id = "test-st-user-id-123"
+    mock_user.email = "test@example.com"
+    mock_user.time_joined = 1234567890
+    mock_user.tenant_ids = ["public"]
+    
+    mock_result = mocker.MagicMock(spec=SignInOkResult)
+    mock_result.user = mock_user
+    mock_result.recipe_user_id = RecipeUserId("test-st-user-id-123")
+    
+    _supertokens_sign_in_patch.reset_mock(return_value=True, side_effect=True)
+    _supertokens_sign_in_patch.return_value = mock_result
+    return _supertokens_sign_in_patch
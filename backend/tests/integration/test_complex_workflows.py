@@ -3,8 +3,65 @@ Integration tests for complex workflows and multi-step user journeys.
 Tests data consistency, end-to-end flows, and system integration.
 """
 
+import asyncio
+from collections import defaultdict
+
 import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from tests.factories import seed_watchlist_rows
+
+
+_CRUD_CREATE = {
+    "anime_id": 4001,
+    "anime_title": "CRUD Test Anime",
+    "status": "watching",
+    "anime_score": 8,
+    "notes": "Great anime!"
+}
+
+WORKFLOW_STATUSES = ["watching", "completed", "on_hold", "dropped", "plan_to_watch"]
+
+
+def _bulk_create(client: TestClient, items: list[dict]) -> list[dict]:
+    """Add items through the batch endpoint and return the created items."""
+    response = client.post("/api/v1/watchlist/batch", json={"items": items})
+    assert response.status_code == 201
+    return response.json()["items"]
+
+
+@pytest.fixture(scope="session")
+def server_caps(app) -> frozenset:
+    """Optional features the app implements, read once from its OpenAPI schema."""
+    paths = app.openapi()["paths"]
+    caps = set()
+    if "/api/v1/watchlist/statistics" in paths:
+        caps.add("statistics")
+    if "put" in paths.get("/api/v1/users/me", {}):
+        caps.add("profile_update")
+    list_params = {
+        param["name"] for param in paths["/api/v1/watchlist"]["get"].get("parameters", [])
+    }
+    caps.update(feature for feature in ("search", "sort") if feature in list_params)
+    return frozenset(caps)
+
+
+@pytest.fixture
+def seeded_statuses(test_session, mock_get_current_user) -> list[dict]:
+    """Seed three items per watch status directly, since setup needn't go through HTTP."""
+    rows = [
+        {
+            "anime_id": 6000 + i * 10 + j,
+            "anime_title": f"Pagination Test Anime {i}-{j}",
+            "status": status,
+            "anime_score": (i + 1) * 2
+        }
+        for i, status in enumerate(WORKFLOW_STATUSES)
+        for j in range(3)  # 3 items per status
+    ]
+    seed_watchlist_rows(test_session, mock_get_current_user, rows)
+    return rows
 
 
 @pytest.mark.integration
@@ -27,11 +84,9 @@ class TestComplexWorkflows:
             {"anime_id": 3003, "anime_title": "Integration Test Anime 3", "status": "plan_to_watch"},
         ]
         
-        created_items = []
-        for item in watchlist_items:
-            response = client.post("/api/v1/watchlist", json=item)
-            assert response.status_code == 201
-            created_items.append(response.json())
+        responses = [client.post("/api/v1/watchlist", json=item) for item in watchlist_items]
+        assert [r.status_code for r in responses] == [201] * len(watchlist_items)
+        created_items = [r.json() for r in responses]
 
         # Step 4: Verify watchlist retrieval
         response = client.get("/api/v1/watchlist")
@@ -40,27 +95,23 @@ class TestComplexWorkflows:
         assert len(data["items"]) >= len(watchlist_items)
         
         # Verify all created items are present
-        retrieved_ids = {item["anime_id"] for item in data["items"]}
-        created_ids = {item["anime_id"] for item in created_items}
-        assert created_ids.issubset(retrieved_ids)
+        created_ids = frozenset(item["anime_id"] for item in created_items)
+        by_id = {item["anime_id"]: item for item in data["items"] if item["anime_id"] in created_ids}
+        assert len(by_id) == len(created_ids)
+        for item in created_items:
+            assert by_id[item["anime_id"]]["status"] == item["status"]
 
     def test_watchlist_crud_operations(self, client: TestClient, mock_get_current_user):
         """Test complete CRUD operations on watchlist."""
         # Create
-        create_data = {
-            "anime_id": 4001,
-            "anime_title": "CRUD Test Anime",
-            "status": "watching",
-            "anime_score": 8,
-            "notes": "Great anime!"
-        }
+        create_data = _CRUD_CREATE
         response = client.post("/api/v1/watchlist", json=create_data)
         assert response.status_code == 201
         created_item = response.json()
-        item_id = created_item["id"]
+        item_url = f"/api/v1/watchlist/{created_item['id']}"
         
         # Read
-        response = client.get(f"/api/v1/watchlist/{item_id}")
+        response = client.get(item_url)
         assert response.status_code == 200
         retrieved_item = response.json()
         assert retrieved_item["anime_id"] == create_data["anime_id"]
@@ -72,7 +123,7 @@ class TestComplexWorkflows:
             "anime_score": 9,
             "notes": "Excellent anime! Highly recommend."
         }
-        response = client.put(f"/api/v1/watchlist/{item_id}", json=update_data)
+        response = client.put(item_url, json=update_data)
         assert response.status_code == 200
         updated_item = response.json()
         assert updated_item["status"] == update_data["status"]
@@ -80,79 +131,79 @@ class TestComplexWorkflows:
         assert updated_item["notes"] == update_data["notes"]
         
         # Delete
-        response = client.delete(f"/api/v1/watchlist/{item_id}")
+        response = client.delete(item_url)
         assert response.status_code == 200  # Returns success message
         assert response.json()["message"] == "Anime removed from watchlist"
         
         # Verify deletion
-        response = client.get(f"/api/v1/watchlist/{item_id}")
+        response = client.get(item_url)
         assert response.status_code == 404
 
-    def test_data_consistency_across_operations(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.asyncio
+    async def test_data_consistency_across_operations(self, async_client: AsyncClient, mock_get_current_user):
         """Test data consistency across multiple operations."""
         # Create multiple items
-        items = []
-        for i in range(5):
-            data = {
+        response = await async_client.post("/api/v1/watchlist/batch", json={"items": [
+            {
                 "anime_id": 5000 + i,
                 "anime_title": f"Consistency Test Anime {i}",
                 "status": "watching",
                 "anime_score": i + 1
             }
-            response = client.post("/api/v1/watchlist", json=data)
-            assert response.status_code == 201
-            items.append(response.json())
+            for i in range(5)
+        ]})
+        assert response.status_code == 201
+        items = response.json()["items"]
         
         # Update all items
-        for item in items:
-            update_data = {"animeScore": item["anime_score"] + 1}
-            response = client.put(f"/api/v1/watchlist/{item['id']}", json=update_data)
-            assert response.status_code == 200
+        responses = await asyncio.gather(*(
+            async_client.put(f"/api/v1/watchlist/{item['id']}", json={"animeScore": item["anime_score"] + 1})
+            for item in items
+        ))
+        assert [r.status_code for r in responses] == [200] * len(items)
         
         # Verify all updates were applied consistently
-        response = client.get("/api/v1/watchlist")
+        response = await async_client.get(f"/api/v1/watchlist?ids={','.join(str(item['id']) for item in items)}")
         assert response.status_code == 200
         data = response.json()
         
-        updated_scores = {item["anime_score"] for item in data["items"] if item["anime_id"] >= 5000}
-        expected_scores = {i + 2 for i in range(5)}  # Original score + 1 (since range starts at 1, scores become 2, 3, 4, 5, 6)
-        assert updated_scores == expected_scores
-
-    def test_pagination_and_filtering_workflow(self, client: TestClient, mock_get_current_user):
-        """Test pagination and filtering in a complete workflow."""
-        # Create items with different statuses
-        statuses = ["watching", "completed", "on_hold", "dropped", "plan_to_watch"]
-        created_items = []
-        
-        for i, status in enumerate(statuses):
-            for j in range(3):  # 3 items per status
-                data = {
-                    "anime_id": 6000 + i * 10 + j,
-                    "anime_title": f"Pagination Test Anime {i}-{j}",
-                    "status": status,
-                    "anime_score": (i + 1) * 2
-                }
-                response = client.post("/api/v1/watchlist", json=data)
-                assert response.status_code == 201
-                created_items.append(response.json())
-        
-        # Test pagination
+        by_id = {item["anime_id"]: item for item in data["items"]}
+        assert len(by_id) == len(items)
+        for i in range(5):
+            # Original score (i + 1) plus one
+            assert by_id[5000 + i]["anime_score"] == i + 2
+
+    def test_pagination_workflow(self, client: TestClient, mock_get_current_user, seeded_statuses):
+        """Test pagination over a mixed-status watchlist."""
         response = client.get("/api/v1/watchlist?limit=5&offset=0")
         assert response.status_code == 200
         data = response.json()
         assert len(data["items"]) == 5
-        assert data["total_count"] >= len(created_items)
-        
-        # Test filtering by status
-        for status in statuses:
-            response = client.get(f"/api/v1/watchlist?status={status}")
-            assert response.status_code == 200
-            data = response.json()
-            # Should only return items with matching status
-            for item in data["items"]:
-                assert item["status"] == status
-        
-        # Test combined pagination and filtering
+        assert data["total_count"] >= len(seeded_statuses)
+
+    @pytest.mark.parametrize("status", WORKFLOW_STATUSES)
+    def test_filter_by_status_workflow(self, client: TestClient, mock_get_current_user, seeded_statuses, status):
+        """Test filtering by each status returns only matching items."""
+        response = client.get(f"/api/v1/watchlist?status={status}")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 3
+        # Should only return items with matching status
+        for item in data["items"]:
+            assert item["status"] == status
+
+    def test_status_distribution_workflow(self, client: TestClient, mock_get_current_user, seeded_statuses):
+        """Test one unfiltered page groups into the seeded per-status counts."""
+        response = client.get("/api/v1/watchlist?limit=100")
+        assert response.status_code == 200
+
+        by_status = defaultdict(list)
+        for item in response.json()["items"]:
+            by_status[item["status"]].append(item)
+        assert {status: len(items) for status, items in by_status.items()} == dict.fromkeys(WORKFLOW_STATUSES, 3)
+
+    def test_pagination_with_filtering_workflow(self, client: TestClient, mock_get_current_user, seeded_statuses):
+        """Test combined pagination and filtering."""
         response = client.get("/api/v1/watchlist?status=watching&limit=2&offset=1")
         assert response.status_code == 200
         data = response.json()
@@ -160,56 +211,53 @@ class TestComplexWorkflows:
         for item in data["items"]:
             assert item["status"] == "watching"
 
-    def test_concurrent_operations_data_integrity(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.asyncio
+    async def test_concurrent_operations_data_integrity(self, async_client: AsyncClient, mock_get_current_user):
         """Test data integrity during concurrent operations."""
         # Create some items first
-        created_items = []
-        for i in range(5):
-            data = {
+        response = await async_client.post("/api/v1/watchlist/batch", json={"items": [
+            {
                 "anime_id": 7000 + i,
                 "anime_title": f"Concurrent Test Anime {i}",
                 "status": "watching"
             }
-            response = client.post("/api/v1/watchlist", json=data)
-            assert response.status_code == 201
-            created_items.append(response.json())
-        
-        # Test concurrent-like operations (sequential but with potential race conditions)
-        results = {"creates": 0, "updates": 0, "errors": 0}
-        
-        # Simulate concurrent operations
-        for i in range(10):
-            try:
-                # Create operation
-                data = {
-                    "anime_id": 7100 + i,
-                    "anime_title": f"Concurrent Test Anime {100 + i}",
-                    "status": "watching"
-                }
-                response = client.post("/api/v1/watchlist", json=data)
-                if response.status_code == 201:
-                    results["creates"] += 1
-                else:
-                    results["errors"] += 1
-            except Exception:
-                results["errors"] += 1
-            
-            try:
-                # Update operation on existing item
-                if created_items:
-                    item_id = created_items[i % len(created_items)]["id"]
-                    response = client.put(f"/api/v1/watchlist/{item_id}", json={"status": "completed"})
-                    if response.status_code == 200:
-                        results["updates"] += 1
-            except Exception:
-                results["errors"] += 1
-        
+            for i in range(5)
+        ]})
+        assert response.status_code == 201
+        created_items = response.json()["items"]
+
+        # Fire creates and updates on existing items concurrently
+        creates = [
+            async_client.post("/api/v1/watchlist", json={
+                "anime_id": 7100 + i,
+                "anime_title": f"Concurrent Test Anime {100 + i}",
+                "status": "watching"
+            })
+            for i in range(10)
+        ]
+        updates = [
+            async_client.put(
+                f"/api/v1/watchlist/{created_items[i % len(created_items)]['id']}",
+                json={"status": "completed"}
+            )
+            for i in range(10)
+        ]
+        responses = await asyncio.gather(*creates, *updates, return_exceptions=True)
+
+        create_results, update_results = responses[:len(creates)], responses[len(creates):]
+        created = sum(1 for r in create_results if not isinstance(r, Exception) and r.status_code == 201)
+        updated = sum(1 for r in update_results if not isinstance(r, Exception) and r.status_code == 200)
+        errors = len(responses) - created - updated
+
         # Verify some operations succeeded
-        assert results["creates"] > 0 or results["updates"] > 0
+        assert created > 0 or updated > 0
         # Error rate should be reasonable
-        total_operations = results["creates"] + results["updates"] + results["errors"]
-        error_rate = results["errors"] / total_operations if total_operations > 0 else 0
-        assert error_rate < 0.5  # Less than 50% error rate
+        assert errors / len(responses) < 0.5  # Less than 50% error rate
+
+        # Every concurrent create should be visible afterwards
+        response = await async_client.get("/api/v1/watchlist?limit=100")
+        listed_ids = {item["anime_id"] for item in response.json()["items"]}
+        assert len(listed_ids & set(range(7100, 7110))) == created
 
     def test_error_recovery_workflow(self, client: TestClient, mock_get_current_user):
         """Test error recovery and system resilience."""
@@ -228,44 +276,46 @@ class TestComplexWorkflows:
         response = client.get(f"/api/v1/watchlist/{created_item['id']}")
         assert response.status_code == 200
 
-    def test_bulk_operations_workflow(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.asyncio
+    async def test_bulk_operations_workflow(self, async_client: AsyncClient, mock_get_current_user):
         """Test bulk operations and batch processing."""
-        # Create multiple items in sequence
-        bulk_items = []
-        for i in range(10):
-            data = {
+        # Create multiple items in one batch
+        response = await async_client.post("/api/v1/watchlist/batch", json={"items": [
+            {
                 "anime_id": 9000 + i,
                 "anime_title": f"Bulk Test Anime {i}",
                 "status": "watching",
                 "anime_score": i % 10 + 1
             }
-            response = client.post("/api/v1/watchlist", json=data)
-            assert response.status_code == 201
-            bulk_items.append(response.json())
+            for i in range(10)
+        ]})
+        assert response.status_code == 201
+        bulk_items = response.json()["items"]
+        item_urls = [f"/api/v1/watchlist/{item['id']}" for item in bulk_items]
         
         # Bulk update - change all to completed
-        for item in bulk_items:
-            response = client.put(f"/api/v1/watchlist/{item['id']}", json={"status": "completed"})
-            assert response.status_code == 200
+        responses = await asyncio.gather(
+            *(async_client.put(url, json={"status": "completed"}) for url in item_urls)
+        )
+        assert [r.status_code for r in responses] == [200] * len(item_urls)
         
         # Verify bulk update
-        response = client.get("/api/v1/watchlist?status=completed")
+        ids = ",".join(str(item["id"]) for item in bulk_items)
+        response = await async_client.get(f"/api/v1/watchlist?status=completed&ids={ids}")
         assert response.status_code == 200
         data = response.json()
-        completed_items = [item for item in data["items"] if item["anime_id"] >= 9000]
-        assert len(completed_items) == len(bulk_items)
+        assert len(data["items"]) == len(bulk_items)
         
         # Bulk delete
-        for item in bulk_items:
-            response = client.delete(f"/api/v1/watchlist/{item['id']}")
-            assert response.status_code == 200
+        responses = await asyncio.gather(*(async_client.delete(url) for url in item_urls))
+        assert [r.status_code for r in responses] == [200] * len(item_urls)
         
         # Verify bulk deletion
-        for item in bulk_items:
-            response = client.get(f"/api/v1/watchlist/{item['id']}")
-            assert response.status_code == 404
+        responses = await asyncio.gather(*(async_client.get(url) for url in item_urls))
+        assert [r.status_code for r in responses] == [404] * len(item_urls)
 
-    def test_search_and_sort_workflow(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.asyncio
+    async def test_search_and_sort_workflow(self, async_client: AsyncClient, mock_get_current_user, server_caps):
         """Test search and sorting functionality in workflows."""
         # Create items with searchable content
         search_items = [
@@ -275,49 +325,53 @@ class TestComplexWorkflows:
             {"anime_id": 10004, "anime_title": "One Piece", "status": "watching", "anime_score": 8},
         ]
         
-        for item in search_items:
-            response = client.post("/api/v1/watchlist", json=item)
-            assert response.status_code == 201
+        responses = await asyncio.gather(
+            *(async_client.post("/api/v1/watchlist", json=item) for item in search_items)
+        )
+        assert [r.status_code for r in responses] == [201] * len(search_items)
         
         # Test search functionality (if implemented)
-        # This would depend on search implementation
-        response = client.get("/api/v1/watchlist?search=dragon")
-        if response.status_code == 200:  # If search is implemented
+        if "search" in server_caps:
+            response = await async_client.get("/api/v1/watchlist?search=dragon")
+            assert response.status_code == 200
             data = response.json()
             dragon_items = [item for item in data["items"] if "dragon" in item["anime_title"].lower()]
             assert len(dragon_items) >= 2
         
         # Test sorting by score (if implemented)
-        response = client.get("/api/v1/watchlist?sort=score&order=desc")
-        assert response.status_code == 200
-        data = response.json()
-        scores = [item["anime_score"] for item in data["items"] if item.get("anime_score") is not None]
-        # Note: Sorting is not currently implemented, so order may not be guaranteed
-        # Just verify we get the expected items
-        assert len(scores) >= 4
+        if "sort" in server_caps:
+            response = await async_client.get("/api/v1/watchlist?sort=score&order=desc")
+            assert response.status_code == 200
+            data = response.json()
+            search_ids = frozenset(item["anime_id"] for item in search_items)
+            scores = [item["anime_score"] for item in data["items"] if item["anime_id"] in search_ids]
+            assert scores == sorted((item["anime_score"] for item in search_items), reverse=True)
 
-    def test_user_profile_workflow(self, client: TestClient, mock_get_current_user):
+    def test_user_profile_workflow(self, client: TestClient, mock_get_current_user, server_caps):
         """Test user profile management workflow."""
+        if "profile_update" not in server_caps:
+            pytest.skip("profile update endpoint not implemented")
+
         # Get user profile
         response = client.get("/api/v1/users/me")
         assert response.status_code == 200
         
-        # Update profile (if implemented)
+        # Update profile
         update_data = {"full_name": "Updated Name"}
         response = client.put("/api/v1/users/me", json=update_data)
-        if response.status_code == 200:  # If profile update is implemented
-            updated_profile = response.json()
-            assert updated_profile["full_name"] == update_data["full_name"]
+        assert response.status_code == 200
+        assert response.json()["full_name"] == update_data["full_name"]
         
         # Verify profile persistence
         response = client.get("/api/v1/users/me")
         assert response.status_code == 200
-        final_profile = response.json()
-        if "full_name" in update_data and "full_name" in final_profile:
-            assert final_profile["full_name"] == update_data["full_name"]
+        assert response.json()["full_name"] == update_data["full_name"]
 
-    def test_watchlist_statistics_workflow(self, client: TestClient, mock_get_current_user):
+    def test_watchlist_statistics_workflow(self, client: TestClient, mock_get_current_user, test_session, server_caps):
         """Test watchlist statistics and analytics."""
+        if "statistics" not in server_caps:
+            pytest.skip("statistics endpoint not implemented")
+
         # Create diverse watchlist for statistics
         stats_items = [
             {"anime_id": 11001, "anime_title": "Stats Anime 1", "status": "completed", "anime_score": 8},
@@ -327,16 +381,34 @@ class TestComplexWorkflows:
             {"anime_id": 11005, "anime_title": "Stats Anime 5", "status": "dropped", "anime_score": 5},
         ]
         
-        for item in stats_items:
-            response = client.post("/api/v1/watchlist", json=item)
-            assert response.status_code == 201
+        seed_watchlist_rows(test_session, mock_get_current_user, stats_items)
         
-        # Get statistics (if implemented)
+        # Get statistics
         response = client.get("/api/v1/watchlist/statistics")
-        if response.status_code == 200:  # If statistics endpoint exists
-            stats = response.json()
-            # Verify basic statistics
-            assert "total_anime" in stats
-            assert "completed_count" in stats
-            assert stats["total_anime"] >= len(stats_items)
-            assert stats["completed_count"] >= 2  # At least the completed items
+        assert response.status_code == 200
+        stats = response.json()
+        # Verify basic statistics
+        assert "total_anime" in stats
+        assert "completed_count" in stats
+        assert stats["total_anime"] >= len(stats_items)
+        assert stats["completed_count"] >= 2  # At least the completed items
+
+    # The probe pair must share a worker to check the rollback between them
+    @pytest.mark.xdist_group(name="isolation-probe")
+    def test_api_writes_commit_within_test(self, client: TestClient, mock_get_current_user):
+        """Test items added through the API are committed and readable in the same test."""
+        response = client.post(
+            "/api/v1/watchlist",
+            json={"anime_id": 3999, "anime_title": "Isolation Probe", "status": "watching"},
+        )
+        assert response.status_code == 201
+
+        response = client.get("/api/v1/watchlist/anime/3999")
+        assert response.json()["anime_title"] == "Isolation Probe"
+
+    @pytest.mark.xdist_group(name="isolation-probe")
+    def test_api_writes_do_not_leak_between_tests(self, client: TestClient, mock_get_current_user):
+        """Test the previous test's committed item was rolled back with its transaction."""
+        response = client.get("/api/v1/watchlist/anime/3999")
+        assert response.status_code == 200
+        assert response.json() is None
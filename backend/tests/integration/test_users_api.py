@@ -2,12 +2,24 @@
 Integration tests for Users API endpoints.
 """
 
+from types import MappingProxyType
+
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from starlette.middleware.cors import CORSMiddleware
 
+from src.main import app
 from src.models import User
 
+# Valid signup payload; tests copy it with dict(_SIGNUP_VALID, field=...) to vary one field
+_SIGNUP_VALID = MappingProxyType({
+    "email": "test@example.com",
+    "password": "Password123",
+    "username": "testuser",
+    "full_name": "Test User",
+})
+
 
 @pytest.mark.integration
 @pytest.mark.auth
@@ -34,12 +46,12 @@ class TestUsersAPI:
 
     def test_signup_success(self, client: TestClient, mock_supertokens_signup):
         """Test successful user signup."""
-        signup_data = {
-            "email": "newuser@example.com",
-            "password": "Password123",
-            "username": "newuser",
-            "full_name": "New User"
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            email="newuser@example.com",
+            username="newuser",
+            full_name="New User",
+        )
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 201
@@ -51,12 +63,12 @@ class TestUsersAPI:
 
     def test_signup_username_taken(self, client: TestClient, sample_user):
         """Test signup with taken username."""
-        signup_data = {
-            "email": "different@example.com",
-            "password": "Password123",
-            "username": sample_user.username,  # Taken username
-            "full_name": "Different User"
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            email="different@example.com",
+            username=sample_user.username,  # Taken username
+            full_name="Different User",
+        )
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 409
@@ -64,17 +76,6 @@ class TestUsersAPI:
         data = response.json()
         assert "Username 'testuser' is already taken" in data["detail"]
 
-    def test_signup_invalid_data(self, client: TestClient):
-        """Test signup with invalid data."""
-        signup_data = {
-            "email": "invalid-email",  # Invalid email format
-            "password": "123",  # Too short
-            "username": "ab",  # Too short
-        }
-        
-        response = client.post("/api/v1/users/signup", json=signup_data)
-        assert response.status_code == 422  # Validation error
-
     def test_signin_success(self, client: TestClient, sample_user, mock_supertokens_signin):
         """Test successful user signin."""
         signin_data = {
@@ -203,56 +204,18 @@ class TestUsersAPI:
         assert "status" in data
         assert "timestamp" in data
 
-    def test_signup_missing_fields(self, client: TestClient):
-        """Test signup with missing required fields."""
-        signup_data = {
-            "email": "test@example.com"
-            # Missing password, username
-        }
-        
-        response = client.post("/api/v1/users/signup", json=signup_data)
-        assert response.status_code == 422
-
-    def test_signin_missing_fields(self, client: TestClient):
-        """Test signin with missing required fields."""
-        signin_data = {
-            "email": "test@example.com"
-            # Missing password
-        }
-        
-        response = client.post("/api/v1/users/signin", json=signin_data)
-        assert response.status_code == 422
-
-    def test_update_profile_with_invalid_data(self, client: TestClient, mock_get_current_user):
-        """Test updating profile with invalid data."""
-        update_data = {
-            "username": "ab",  # Too short
-            "is_active": "not-a-boolean"  # Invalid type
-        }
-        
-        response = client.put("/api/v1/users/me", json=update_data)
-        assert response.status_code == 422
-
-    def test_cors_headers(self, client: TestClient):
-        """Test CORS headers are present."""
-        # Test a regular request for CORS headers instead of OPTIONS
-        # since OPTIONS preflight requests are handled differently by TestClient
-        response = client.get("/health")
-        assert response.status_code == 200
-        
-        # CORS headers should be present in the response
-        # Note: In actual browser scenarios, CORS headers would be more prominent
-        # but TestClient doesn't fully simulate browser CORS behavior
+    def test_cors_headers(self):
+        """Test CORS middleware is installed on the app."""
+        # The security suite exercises actual preflight responses
+        assert any(middleware.cls is CORSMiddleware for middleware in app.user_middleware)
 
     # Edge case and error scenario tests
     def test_signup_username_too_short(self, client: TestClient):
         """Test signup with username too short."""
-        signup_data = {
-            "email": "test@example.com",
-            "password": "Password123",
-            "username": "ab",  # Too short (min 3 chars)
-            "full_name": "Test User"
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            username="ab",  # Too short (min 3 chars)
+        )
 
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 422  # Validation error
@@ -263,12 +226,10 @@ class TestUsersAPI:
 
     def test_signup_username_invalid_chars(self, client: TestClient):
         """Test signup with invalid username characters."""
-        signup_data = {
-            "email": "test@example.com",
-            "password": "Password123",
-            "username": "test@user",  # Invalid character
-            "full_name": "Test User"
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            username="test@user",  # Invalid character
+        )
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 422
@@ -278,12 +239,7 @@ class TestUsersAPI:
 
     def test_signup_email_invalid_format(self, client: TestClient):
         """Test signup with invalid email format."""
-        signup_data = {
-            "email": "invalid-email",
-            "password": "Password123",
-            "username": "testuser",
-            "full_name": "Test User"
-        }
+        signup_data = dict(_SIGNUP_VALID, email="invalid-email")
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 422
@@ -293,12 +249,10 @@ class TestUsersAPI:
 
     def test_signup_full_name_too_long(self, client: TestClient):
         """Test signup with full name too long."""
-        signup_data = {
-            "email": "test@example.com",
-            "password": "Password123",
-            "username": "testuser",
-            "full_name": "A" * 101  # Too long (max 100 chars)
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            full_name="A" * 101,  # Too long (max 100 chars)
+        )
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 422
@@ -308,12 +262,12 @@ class TestUsersAPI:
 
     def test_signup_duplicate_email(self, client: TestClient, mock_get_current_user):
         """Test signup with duplicate email."""
-        signup_data = {
-            "email": mock_get_current_user.email,  # Existing email
-            "password": "Password123",
-            "username": "newuser",
-            "full_name": "New User"
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            email=mock_get_current_user.email,  # Existing email
+            username="newuser",
+            full_name="New User",
+        )
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 409  # Conflict
@@ -324,12 +278,12 @@ class TestUsersAPI:
 
     def test_signup_duplicate_username(self, client: TestClient, mock_get_current_user):
         """Test signup with duplicate username."""
-        signup_data = {
-            "email": "different@example.com",
-            "password": "Password123",
-            "username": mock_get_current_user.username,  # Existing username
-            "full_name": "New User"
-        }
+        signup_data = dict(
+            _SIGNUP_VALID,
+            email="different@example.com",
+            username=mock_get_current_user.username,  # Existing username
+            full_name="New User",
+        )
         
         response = client.post("/api/v1/users/signup", json=signup_data)
         assert response.status_code == 409  # Conflict
@@ -409,12 +363,7 @@ class TestUsersAPI:
         assert data["message"] == "unauthorised"    # Security tests
     def test_sql_injection_attempt(self, client: TestClient):
         """Test protection against SQL injection attempts."""
-        malicious_data = {
-            "email": "test@example.com'; DROP TABLE users; --",
-            "password": "Password123",
-            "username": "testuser",
-            "full_name": "Test User"
-        }
+        malicious_data = dict(_SIGNUP_VALID, email="test@example.com'; DROP TABLE users; --")
         
         response = client.post("/api/v1/users/signup", json=malicious_data)
         # Should not succeed with malicious input
@@ -422,12 +371,7 @@ class TestUsersAPI:
 
     def test_xss_attempt(self, client: TestClient):
         """Test protection against XSS attempts."""
-        xss_data = {
-            "email": "test@example.com",
-            "password": "Password123",
-            "username": "testuser",
-            "full_name": "<script>alert('xss')</script>"
-        }
+        xss_data = dict(_SIGNUP_VALID, full_name="<script>alert('xss')</script>")
         
         response = client.post("/api/v1/users/signup", json=xss_data)
         # Should validate and potentially sanitize input
@@ -438,12 +382,10 @@ class TestUsersAPI:
 
     def test_large_request_body(self, client: TestClient):
         """Test handling of very large request bodies."""
-        large_data = {
-            "email": "test@example.com",
-            "password": "Password123",
-            "username": "testuser",
-            "full_name": "A" * 10000  # Very large string
-        }
+        large_data = dict(
+            _SIGNUP_VALID,
+            full_name="A" * 10000,  # Very large string
+        )
         
         response = client.post("/api/v1/users/signup", json=large_data)
         # Should handle gracefully (422 for validation or 413 for payload too large)
@@ -3,14 +3,76 @@ Performance and load testing for the API.
 Tests response times, concurrent requests, and system performance under load.
 """
 
-import time
-import threading
+import asyncio
+import os
 import statistics
-from typing import List
+import threading
+import time
+import tracemalloc
+from typing import Callable, List
 
-import psutil
+import httpx
 import pytest
+import uvicorn
 from fastapi.testclient import TestClient
+from httpx import AsyncClient, Response
+
+from tests.factories import seed_watchlist
+
+
+def _median_latency(send: Callable[[], Response], samples: int = 10) -> tuple[Response, float]:
+    """Call send repeatedly; return the last response and the median warm latency in seconds."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        response = send()
+        timings.append(time.perf_counter_ns() - start)
+    # The first call pays cold-cache costs, so it is left out
+    return response, statistics.median(timings[1:]) / 1e9
+
+
+# Rows seeded by large_watchlist
+LARGE_WATCHLIST_SIZE = 50
+
+
+@pytest.fixture
+def large_watchlist(test_session, mock_get_current_user) -> int:
+    """Seed the authenticated user's watchlist with items carrying long notes."""
+    # Rows only live as long as the test's transaction, so this cannot be shared wider
+    seed_watchlist(
+        test_session, mock_get_current_user, LARGE_WATCHLIST_SIZE,
+        notes="Detailed notes for this anime. " * 10,
+    )
+    return LARGE_WATCHLIST_SIZE
+
+
+@pytest.fixture(scope="session")
+def live_server(app) -> str:
+    """Serve the app over a real socket from a background thread and yield its base URL."""
+    # Lifespan is off so startup doesn't touch the configured database
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="error", lifespan="off")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            pytest.fail("live server did not start")
+        time.sleep(0.01)
+
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture(scope="session")
+def http(live_server) -> httpx.Client:
+    """One pooled HTTP client against the live server, reused across tests."""
+    with httpx.Client(base_url=live_server, timeout=5.0) as http_client:
+        yield http_client
 
 
 @pytest.mark.performance
@@ -19,47 +81,34 @@ class TestPerformance:
 
     def test_health_check_response_time(self, client: TestClient):
         """Test health check endpoint response time."""
-        start_time = time.time()
-        response = client.get("/health")
-        end_time = time.time()
-        
+        response, response_time = _median_latency(lambda: client.get("/health"))
+
         assert response.status_code == 200
-        response_time = end_time - start_time
         assert response_time < 0.1  # Should respond within 100ms
 
     def test_detailed_health_check_response_time(self, client: TestClient):
         """Test detailed health check endpoint response time."""
-        start_time = time.time()
-        response = client.get("/health/detailed")
-        end_time = time.time()
-        
+        # Each call samples CPU usage for 100ms, so take fewer samples
+        response, response_time = _median_latency(lambda: client.get("/health/detailed"), samples=3)
+
         assert response.status_code == 200
-        response_time = end_time - start_time
         assert response_time < 0.5  # Should respond within 500ms
 
-    def test_concurrent_health_checks(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_concurrent_health_checks(self, async_client: AsyncClient):
         """Test multiple concurrent health check requests."""
-        def make_request() -> float:
-            start = time.time()
-            response = client.get("/health")
-            end = time.time()
-            assert response.status_code == 200
-            return end - start
+        async def timed_request() -> tuple[int, float]:
+            start = time.perf_counter()
+            # The route is mounted at /health/; httpx does not follow the redirect
+            response = await async_client.get("/health/")
+            return response.status_code, time.perf_counter() - start
 
         # Test with 20 concurrent requests
         num_requests = 20
-        response_times: List[float] = []
-
-        threads = []
-        for _ in range(num_requests):
-            thread = threading.Thread(target=lambda: response_times.append(make_request()))
-            threads.append(thread)
-            thread.start()
+        results = await asyncio.gather(*(timed_request() for _ in range(num_requests)))
 
-        for thread in threads:
-            thread.join(timeout=10)
-
-        assert len(response_times) == num_requests
+        assert [status_code for status_code, _ in results] == [200] * num_requests
+        response_times: List[float] = [elapsed for _, elapsed in results]
         
         # Analyze response times
         avg_time = statistics.mean(response_times)
@@ -71,64 +120,59 @@ class TestPerformance:
         assert max_time < 1.0  # Max under 1 second
         assert p95_time < 0.5  # 95th percentile under 500ms
 
-    def test_database_query_performance(self, client: TestClient, mock_get_current_user):
+    def test_database_query_performance(self, client: TestClient, mock_get_current_user, test_session):
         """Test database query performance for watchlist operations."""
-        # Create some test data first
-        for i in range(10):
-            watchlist_data = {
-                "anime_id": 1000 + i,
-                "anime_title": f"Performance Test Anime {i}",
-                "status": "watching"
-            }
-            response = client.post("/api/v1/watchlist", json=watchlist_data)
-            assert response.status_code == 201
+        # Seed directly so the timing below covers only the read path
+        seed_watchlist(test_session, mock_get_current_user, 10, status="watching")
 
         # Test watchlist retrieval performance
-        start_time = time.time()
-        response = client.get("/api/v1/watchlist")
-        end_time = time.time()
-        
+        response, response_time = _median_latency(lambda: client.get("/api/v1/watchlist"))
+
         assert response.status_code == 200
-        response_time = end_time - start_time
         assert response_time < 0.5  # Should respond within 500ms
 
         data = response.json()
         assert len(data["items"]) >= 10
 
-    def test_pagination_performance(self, client: TestClient, mock_get_current_user):
+    def test_pagination_performance(self, client: TestClient, large_watchlist):
         """Test pagination performance with large datasets."""
         # Test with different page sizes
         page_sizes = [10, 50, 100]
         
         for limit in page_sizes:
-            start_time = time.time()
-            response = client.get(f"/api/v1/watchlist?limit={limit}")
-            end_time = time.time()
-            
+            response, response_time = _median_latency(
+                lambda limit=limit: client.get(f"/api/v1/watchlist?limit={limit}")
+            )
+
             assert response.status_code == 200
-            response_time = end_time - start_time
+            assert len(response.json()["items"]) == min(limit, large_watchlist)
             
             # Larger pages can take longer but should still be reasonable
             max_expected_time = 0.1 + (limit * 0.001)  # Base 100ms + 1ms per item
             assert response_time < max_expected_time
 
+    @pytest.mark.skipif(not os.getenv("MEASURE_MEMORY"), reason="set MEASURE_MEMORY=1 to measure memory")
     def test_memory_usage_stability(self, client: TestClient):
         """Test that memory usage remains stable under load."""
-        import os
-        
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-        
-        # Make many requests
-        for _ in range(100):
-            response = client.get("/health")
-            assert response.status_code == 200
+        # tracemalloc sees only Python allocations made during the loop, not
+        # the rest of the process (pytest, other workers, imported modules)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            
+            # Make many requests
+            for _ in range(100):
+                response = client.get("/health")
+                assert response.status_code == 200
+            
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
         
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        memory_increase = final_memory - initial_memory
+        memory_increase = sum(stat.size_diff for stat in after.compare_to(before, "lineno"))
         
-        # Memory increase should be minimal (less than 10MB)
-        assert memory_increase < 10.0
+        # Memory increase should be minimal (less than 1MB)
+        assert memory_increase < 1_000_000
 
     def test_rate_limiting_performance(self, client: TestClient):
         """Test that rate limiting doesn't significantly impact performance."""
@@ -136,11 +180,9 @@ class TestPerformance:
         response_times = []
         
         for i in range(15):  # More than the limit of 10
-            start_time = time.time()
+            start_time = time.perf_counter()
             response = client.get("/health")  # This endpoint might have rate limiting
-            end_time = time.time()
-            
-            response_times.append(end_time - start_time)
+            response_times.append(time.perf_counter() - start_time)
             
             # Some requests should be rate limited
             if i >= 10:  # Assuming 10 requests per window
@@ -152,77 +194,75 @@ class TestPerformance:
         avg_time = statistics.mean(response_times)
         assert avg_time < 0.2  # Average under 200ms
 
-    def test_cache_performance(self, client: TestClient, mock_get_current_user):
-        """Test caching performance improvements."""
-        # First request (should cache)
-        start_time = time.time()
+    def test_cache_performance(self, client: TestClient, mock_get_current_user, shared_cache, query_counter):
+        """Test repeat watchlist reads are served status counts from the cache."""
+        # First request misses the cache: status aggregate plus the page query
+        query_counter.reset()
         response1 = client.get("/api/v1/watchlist")
-        end_time = time.time()
-        first_request_time = end_time - start_time
-        
         assert response1.status_code == 200
-        
-        # Second request (should use cache)
-        start_time = time.time()
+        assert query_counter.count == 2
+
+        # Second request hits the cache and only fetches the page
+        query_counter.reset()
         response2 = client.get("/api/v1/watchlist")
-        end_time = time.time()
-        second_request_time = end_time - start_time
-        
         assert response2.status_code == 200
-        
-        # Cached request should be faster (at least 20% improvement)
-        if second_request_time > 0:  # Avoid division by zero
-            improvement_ratio = first_request_time / second_request_time
-            assert improvement_ratio > 1.1  # At least 10% improvement
+        assert query_counter.count == 1
+
+        assert response2.json()["status_counts"] == response1.json()["status_counts"]
 
     @pytest.mark.slow
-    def test_sustained_load(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_sustained_load(self, async_client: AsyncClient):
         """Test sustained load over time."""
-        import time
-        
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 1.0
         request_count = 0
         errors = 0
-        
-        # Run for 10 seconds
-        while time.time() - start_time < 10:
-            try:
-                response = client.get("/health")
-                assert response.status_code == 200
-                request_count += 1
-            except Exception:
-                errors += 1
-            
-            time.sleep(0.01)  # Small delay between requests
-        
-        # Should handle at least 50 requests in 10 seconds
-        assert request_count >= 50
+
+        # Keep batches of concurrent requests in flight for one second
+        while loop.time() < deadline:
+            results = await asyncio.gather(
+                *(asyncio.wait_for(async_client.get("/health/"), timeout=1.0) for _ in range(20)),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception) or result.status_code != 200:
+                    errors += 1
+                else:
+                    request_count += 1
+
+        # Should handle at least 100 requests in one second
+        assert request_count >= 100
         # Error rate should be very low
         error_rate = errors / (request_count + errors) if (request_count + errors) > 0 else 0
         assert error_rate < 0.05  # Less than 5% error rate
 
-    def test_large_response_handling(self, client: TestClient, mock_get_current_user):
+    def test_large_response_handling(self, client: TestClient, large_watchlist):
         """Test handling of potentially large responses."""
-        # Add many items to create a large response
-        for i in range(50):
-            watchlist_data = {
-                "anime_id": 2000 + i,
-                "anime_title": f"Large Response Test Anime {i}",
-                "status": "watching",
-                "notes": f"Detailed notes for anime {i}. " * 10  # Make notes longer
-            }
-            response = client.post("/api/v1/watchlist", json=watchlist_data)
-            if response.status_code != 201:
-                # Might fail due to unique constraints, that's ok
-                break
-        
         # Test retrieval of large dataset
-        start_time = time.time()
-        response = client.get("/api/v1/watchlist?limit=100")
-        end_time = time.time()
-        
+        response, response_time = _median_latency(lambda: client.get("/api/v1/watchlist?limit=100"))
+
         assert response.status_code == 200
-        response_time = end_time - start_time
         
         # Should handle large responses reasonably well
         assert response_time < 2.0  # Under 2 seconds for large response
+
+
+@pytest.mark.performance
+class TestLiveServerPerformance:
+    """Performance over real sockets, where connection reuse matters."""
+
+    def test_health_checks_reuse_one_connection(self, http: httpx.Client):
+        """Test sequential requests on a pooled client share one keep-alive connection."""
+        client_ports = set()
+
+        def send() -> Response:
+            response = http.get("/health/")
+            client_ports.add(response.extensions["network_stream"].get_extra_info("client_addr")[1])
+            return response
+
+        response, response_time = _median_latency(send, samples=50)
+
+        assert response.status_code == 200
+        assert len(client_ports) == 1
+        assert response_time < 0.05  # Median under 50ms without connection setup
@@ -3,62 +3,108 @@ Security testing for the API.
 Tests authentication, authorization, input validation, and security vulnerabilities.
 """
 
+import asyncio
 import json
+from types import MappingProxyType
+
 import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+# Status codes a request may end with, shared across parametrized cases
+_CREATED_OR_REJECTED = frozenset({201, 400, 422})
+_REJECTED = frozenset({400, 422})
+_REJECTED_OR_TOO_LARGE = frozenset({400, 413, 422})
+_AUTH_REQUIRED = frozenset({401, 403})
+
+# Payloads are read-only; tests send a dict() copy or a pre-serialized body
+_SQL_INJECTION_WATCHLIST = (
+    MappingProxyType({"anime_id": "1' OR '1'='1", "anime_title": "Test", "status": "watching"}),
+    MappingProxyType({"anime_id": "1; DROP TABLE watchlist;--", "anime_title": "Test", "status": "watching"}),
+    MappingProxyType({"anime_id": "1 UNION SELECT * FROM users;--", "anime_title": "Test", "status": "watching"}),
+    MappingProxyType({"anime_title": "Test'; SELECT * FROM users;--", "anime_id": 1, "status": "watching"}),
+)
+
+_SQL_INJECTION_USERS = (
+    MappingProxyType({"username": "admin'--", "email": "test@example.com", "password": "password123"}),
+    MappingProxyType({"username": "test", "email": "test@example.com' OR '1'='1", "password": "password123"}),
+    MappingProxyType({"username": "test'; DROP TABLE users;--", "email": "test@example.com", "password": "password123"}),
+)
+
+_XSS_PAYLOADS = (
+    MappingProxyType({"anime_id": 1, "anime_title": "<script>alert('xss')</script>", "status": "watching"}),
+    MappingProxyType({"anime_id": 2, "anime_title": "<img src=x onerror=alert('xss')>", "status": "watching"}),
+    MappingProxyType({"anime_id": 3, "anime_title": "javascript:alert('xss')", "status": "watching"}),
+    MappingProxyType({"anime_id": 4, "anime_title": "<iframe src='javascript:alert(\"xss\")'>", "status": "watching"}),
+)
+
+_INVALID_ID_PAYLOADS = (
+    MappingProxyType({"anime_id": -1, "anime_title": "Test", "status": "watching"}),
+    MappingProxyType({"anime_id": 0, "anime_title": "Test", "status": "watching"}),  # Zero might be invalid
+    MappingProxyType({"anime_id": "not_a_number", "anime_title": "Test", "status": "watching"}),
+    MappingProxyType({"anime_id": None, "anime_title": "Test", "status": "watching"}),
+)
+
+_NULL_BYTE_PAYLOADS = (
+    MappingProxyType({"anime_id": 1, "anime_title": "Test\x00<script>", "status": "watching"}),
+    MappingProxyType({"anime_id": 2, "anime_title": "Test%00Union", "status": "watching"}),
+)
+
+_JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+
+def _json_bodies(payloads):
+    """Serialize each payload once at import so tests post ready-made bytes."""
+    return tuple(json.dumps(dict(payload)).encode() for payload in payloads)
+
+
+def _with_bodies(payloads):
+    """Pair each payload with its pre-serialized JSON body."""
+    return tuple(zip(payloads, _json_bodies(payloads)))
+
+
+_MALFORMED_JSON_BODIES = (
+    '{"anime_id": 1, "anime_title": "Test", "status": "watching"',  # Missing closing brace
+    '{"anime_id": 1, "anime_title": "Test", "status": "watching",}',  # Trailing comma
+    '{"anime_id": 1, "anime_title": "Test" "status": "watching"}',  # Missing comma
+)
+
+_INJECTED_HEADERS = (
+    ("User-Agent", "test\r\nX-Injected: value"),
+    ("Referer", "http://example.com\r\nSet-Cookie: malicious=value"),
+)
 
 
 @pytest.mark.security
 class TestSecurity:
     """Security and vulnerability testing."""
 
-    def test_sql_injection_protection_watchlist(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.parametrize("body", _json_bodies(_SQL_INJECTION_WATCHLIST))
+    def test_sql_injection_protection_watchlist(self, client: TestClient, mock_get_current_user, body):
         """Test protection against SQL injection in watchlist operations."""
-        # Test various SQL injection attempts
-        injection_payloads = [
-            {"anime_id": "1' OR '1'='1", "anime_title": "Test", "status": "watching"},
-            {"anime_id": "1; DROP TABLE watchlist;--", "anime_title": "Test", "status": "watching"},
-            {"anime_id": "1 UNION SELECT * FROM users;--", "anime_title": "Test", "status": "watching"},
-            {"anime_title": "Test'; SELECT * FROM users;--", "anime_id": 1, "status": "watching"},
-        ]
-        
-        for payload in injection_payloads:
-            response = client.post("/api/v1/watchlist", json=payload)
-            # Should either reject the request or sanitize it
-            assert response.status_code in [201, 400, 422]  # Created, Bad Request, or Validation Error
+        response = client.post("/api/v1/watchlist", content=body, headers=_JSON_HEADERS)
+        # Should either reject the request or sanitize it
+        assert response.status_code in _CREATED_OR_REJECTED
 
-    def test_sql_injection_protection_users(self, client: TestClient):
+    @pytest.mark.parametrize("payload", _SQL_INJECTION_USERS)
+    def test_sql_injection_protection_users(self, client: TestClient, payload):
         """Test protection against SQL injection in user operations."""
-        injection_payloads = [
-            {"username": "admin'--", "email": "test@example.com", "password": "password123"},
-            {"username": "test", "email": "test@example.com' OR '1'='1", "password": "password123"},
-            {"username": "test'; DROP TABLE users;--", "email": "test@example.com", "password": "password123"},
-        ]
-        
-        for payload in injection_payloads:
-            response = client.post("/api/v1/users/signup", json=payload)
-            # Should reject malformed input
-            assert response.status_code in [400, 422]
+        response = client.post("/api/v1/users/signup", json=dict(payload))
+        # Should reject malformed input
+        assert response.status_code in _REJECTED
 
-    def test_xss_protection(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.parametrize("payload, body", _with_bodies(_XSS_PAYLOADS))
+    def test_xss_protection(self, client: TestClient, mock_get_current_user, payload, body):
         """Test protection against XSS attacks."""
-        xss_payloads = [
-            {"anime_id": 1, "anime_title": "<script>alert('xss')</script>", "status": "watching"},
-            {"anime_id": 2, "anime_title": "<img src=x onerror=alert('xss')>", "status": "watching"},
-            {"anime_id": 3, "anime_title": "javascript:alert('xss')", "status": "watching"},
-            {"anime_id": 4, "anime_title": "<iframe src='javascript:alert(\"xss\")'>", "status": "watching"},
-        ]
+        response = client.post("/api/v1/watchlist", content=body, headers=_JSON_HEADERS)
+        assert response.status_code in _CREATED_OR_REJECTED
         
-        for payload in xss_payloads:
-            response = client.post("/api/v1/watchlist", json=payload)
-            assert response.status_code in [201, 400, 422]
-            
-            if response.status_code == 201:
-                data = response.json()
-                # Note: Current implementation stores XSS payloads - this is a security concern
-                # The API should sanitize input or reject XSS payloads
-                # For now, test that the data is stored as-is
-                assert data["anime_title"] == payload["anime_title"]
+        if response.status_code == 201:
+            data = response.json()
+            # Note: Current implementation stores XSS payloads - this is a security concern
+            # The API should sanitize input or reject XSS payloads
+            # For now, test that the data is stored as-is
+            assert data["anime_title"] == payload["anime_title"]
 
     def test_input_validation_bounds(self, client: TestClient, mock_get_current_user):
         """Test input validation for field length limits and bounds."""
@@ -72,52 +118,37 @@ class TestSecurity:
             "status": "watching",
             "notes": long_notes
         }
-        
+
         response = client.post("/api/v1/watchlist", json=payload)
         # Should reject overly long input
-        assert response.status_code in [400, 422]
+        assert response.status_code in _REJECTED
 
-    def test_negative_id_protection(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.parametrize("body", _json_bodies(_INVALID_ID_PAYLOADS))
+    def test_negative_id_protection(self, client: TestClient, mock_get_current_user, body):
         """Test protection against negative IDs and invalid data types."""
-        invalid_payloads = [
-            {"anime_id": -1, "anime_title": "Test", "status": "watching"},
-            {"anime_id": 0, "anime_title": "Test", "status": "watching"},  # Zero might be invalid
-            {"anime_id": "not_a_number", "anime_title": "Test", "status": "watching"},
-            {"anime_id": None, "anime_title": "Test", "status": "watching"},
-        ]
-        
-        for payload in invalid_payloads:
-            response = client.post("/api/v1/watchlist", json=payload)
-            assert response.status_code in [400, 422]
+        response = client.post("/api/v1/watchlist", content=body, headers=_JSON_HEADERS)
+        assert response.status_code in _REJECTED
 
-    def test_rate_limit_enforcement(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_rate_limit_enforcement(self, async_client: AsyncClient):
         """Test that rate limiting is properly enforced."""
-        # Make many rapid requests to trigger rate limiting
-        responses = []
-        for _ in range(20):  # More than typical rate limit
-            response = client.get("/health")  # Use health endpoint which might have rate limiting
-            responses.append(response.status_code)
+        # Fire many requests at once to trigger rate limiting
+        # The route is mounted at /health/; httpx does not follow the redirect
+        responses = await asyncio.gather(*(async_client.get("/health/") for _ in range(20)))
         
         # Note: Rate limiting is not currently implemented
         # All requests should succeed without rate limiting
-        assert all(status == 200 for status in responses)
-
-    def test_authentication_required(self, client: TestClient):
+        assert [r.status_code for r in responses] == [200] * 20
+
+    @pytest.mark.parametrize("method, endpoint, body", [
+        ("GET", "/api/v1/watchlist", None),
+        ("POST", "/api/v1/watchlist", {}),
+        ("GET", "/api/v1/users/me", None),
+    ])
+    def test_authentication_required(self, client: TestClient, method, endpoint, body):
         """Test that protected endpoints require authentication."""
-        protected_endpoints = [
-            ("GET", "/api/v1/watchlist"),
-            ("POST", "/api/v1/watchlist"),
-            ("GET", "/api/v1/users/me"),
-        ]
-        
-        for method, endpoint in protected_endpoints:
-            if method == "GET":
-                response = client.get(endpoint)
-            elif method == "POST":
-                response = client.post(endpoint, json={})
-            
-            # Should require authentication
-            assert response.status_code in [401, 403]
+        response = client.request(method, endpoint, json=body)
+        assert response.status_code in _AUTH_REQUIRED
 
     def test_cors_headers(self, client: TestClient):
         """Test CORS headers are properly set."""
@@ -158,6 +189,12 @@ class TestSecurity:
             # Should not cause issues
             assert response.status_code == 200
 
+    def test_buffer_overflow_protection_smoke(self, client: TestClient, mock_get_current_user):
+        """Test an oversized payload of unexpected shape is rejected."""
+        response = client.post("/api/v1/watchlist", json={"data": "x" * 4096})
+        assert response.status_code in _REJECTED_OR_TOO_LARGE
+
+    @pytest.mark.slow
     def test_buffer_overflow_protection(self, client: TestClient, mock_get_current_user):
         """Test protection against buffer overflow attempts."""
         # Send extremely large JSON payload
@@ -165,52 +202,35 @@ class TestSecurity:
         
         response = client.post("/api/v1/watchlist", json=large_payload)
         # Should reject or handle gracefully
-        assert response.status_code in [400, 413, 422]
+        assert response.status_code in _REJECTED_OR_TOO_LARGE
 
-    def test_null_byte_injection(self, client: TestClient, mock_get_current_user):
+    @pytest.mark.parametrize("payload, body", _with_bodies(_NULL_BYTE_PAYLOADS))
+    def test_null_byte_injection(self, client: TestClient, mock_get_current_user, payload, body):
         """Test protection against null byte injection."""
-        null_byte_payloads = [
-            {"anime_id": 1, "anime_title": "Test\x00<script>", "status": "watching"},
-            {"anime_id": 2, "anime_title": "Test%00Union", "status": "watching"},
-        ]
-        
-        for payload in null_byte_payloads:
-            response = client.post("/api/v1/watchlist", json=payload)
-            assert response.status_code in [201, 400, 422]
-            
-            if response.status_code == 201:
-                data = response.json()
-                # Null bytes should be handled safely
-                assert "\x00" not in json.dumps(data)
-
-    def test_malformed_json_handling(self, client: TestClient, mock_get_current_user):
+        response = client.post("/api/v1/watchlist", content=body, headers=_JSON_HEADERS)
+        assert response.status_code in _CREATED_OR_REJECTED
+
+        if response.status_code == 201:
+            # The title must round-trip whole rather than being cut at the null byte
+            assert response.json()["anime_title"] == payload["anime_title"]
+
+    @pytest.mark.parametrize("payload", _MALFORMED_JSON_BODIES)
+    def test_malformed_json_handling(self, client: TestClient, mock_get_current_user, payload):
         """Test handling of malformed JSON."""
-        malformed_payloads = [
-            '{"anime_id": 1, "anime_title": "Test", "status": "watching"',  # Missing closing brace
-            '{"anime_id": 1, "anime_title": "Test", "status": "watching",}',  # Trailing comma
-            '{"anime_id": 1, "anime_title": "Test" "status": "watching"}',  # Missing comma
-        ]
-        
-        for payload in malformed_payloads:
-            response = client.post(
-                "/api/v1/watchlist",
-                content=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            # Should reject malformed JSON - FastAPI returns 422 for validation errors
-            assert response.status_code in [400, 422]
-
-    def test_header_injection_protection(self, client: TestClient):
+        response = client.post(
+            "/api/v1/watchlist",
+            content=payload,
+            headers={"Content-Type": "application/json"}
+        )
+        # Should reject malformed JSON - FastAPI returns 422 for validation errors
+        assert response.status_code in _REJECTED
+
+    @pytest.mark.parametrize("header, value", _INJECTED_HEADERS)
+    def test_header_injection_protection(self, client: TestClient, header, value):
         """Test protection against HTTP header injection."""
         # Try to inject headers through user input
-        injection_headers = {
-            "User-Agent": "test\r\nX-Injected: value",
-            "Referer": "http://example.com\r\nSet-Cookie: malicious=value",
-        }
-        
-        for header, value in injection_headers.items():
-            response = client.get("/health", headers={header: value})
-            # Should handle safely without injecting headers
-            assert response.status_code == 200
-            # Check that no malicious headers were set in response
-            assert "set-cookie" not in [h.lower() for h in response.headers.keys()]
+        response = client.get("/health", headers={header: value})
+        # Should handle safely without injecting headers
+        assert response.status_code == 200
+        # Check that no malicious headers were set in response
+        assert "set-cookie" not in response.headers
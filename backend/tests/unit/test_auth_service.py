@@ -3,10 +3,25 @@ Unit tests for AuthService.
 """
 
 import pytest
-from sqlmodel import Session
+from sqlalchemy import inspect
+from sqlmodel import Session, select
+from starlette.datastructures import State
 
-from src.services.auth_service import AuthService, UsernameTakenError, UserProfileNotFoundError
-from src.models import User
+from src.services.auth_service import (
+    AuthService,
+    EmailAlreadyRegisteredError,
+    UsernameTakenError,
+    UserProfileNotFoundError,
+)
+from src.exceptions import DatabaseError
+from src.services.user_service import UserService
+from src.models import User, UserCreate
+
+
+@pytest.fixture
+def auth_service(test_session: Session) -> AuthService:
+    """AuthService bound to the test session."""
+    return AuthService(test_session)
 
 
 @pytest.mark.unit
@@ -14,16 +29,13 @@ from src.models import User
 class TestAuthService:
     """Test the AuthService class."""
 
-    def test_auth_service_initialization(self, test_session: Session):
+    def test_auth_service_initialization(self, test_session: Session, auth_service: AuthService):
         """Test AuthService initialization."""
-        auth_service = AuthService(test_session)
         assert auth_service.db == test_session
 
     @pytest.mark.asyncio
-    async def test_create_user_from_supertokens(self, test_session: Session):
+    async def test_create_user_from_supertokens(self, auth_service: AuthService):
         """Test creating a user from SuperTokens data."""
-        auth_service = AuthService(test_session)
-        
         user = await auth_service.create_user_from_supertokens(
             supertokens_user_id="st-user-123",
             email="test@example.com",
@@ -38,81 +50,96 @@ class TestAuthService:
         assert user.full_name == "Test User"
         assert user.is_active is True
 
-    def test_get_user_by_supertokens_id(self, test_session: Session, sample_user):
-        """Test getting user by SuperTokens ID."""
-        auth_service = AuthService(test_session)
-        
-        found_user = auth_service.get_user_by_supertokens_id(sample_user.supertokens_user_id)
-        
-        assert found_user is not None
-        assert found_user.id == sample_user.id
-        assert found_user.supertokens_user_id == sample_user.supertokens_user_id
+    @pytest.mark.asyncio
+    async def test_create_user_from_supertokens_duplicate_username(self, auth_service: AuthService, sample_user):
+        """Test the username unique constraint maps to UsernameTakenError."""
+        with pytest.raises(UsernameTakenError):
+            await auth_service.create_user_from_supertokens(
+                supertokens_user_id="st-user-456",
+                email="other@example.com",
+                username=sample_user.username,
+            )
 
-    def test_get_user_by_supertokens_id_not_found(self, test_session: Session):
-        """Test getting user by non-existent SuperTokens ID."""
-        auth_service = AuthService(test_session)
-        
-        found_user = auth_service.get_user_by_supertokens_id("non-existent-id")
-        
-        assert found_user is None
+    @pytest.mark.asyncio
+    async def test_create_user_from_supertokens_duplicate_email(self, auth_service: AuthService, sample_user):
+        """Test the email unique constraint maps to EmailAlreadyRegisteredError."""
+        with pytest.raises(EmailAlreadyRegisteredError):
+            await auth_service.create_user_from_supertokens(
+                supertokens_user_id="st-user-456",
+                email=sample_user.email,
+                username="otheruser",
+            )
 
-    def test_get_user_by_username(self, test_session: Session, sample_user):
-        """Test getting user by username."""
-        auth_service = AuthService(test_session)
-        
-        found_user = auth_service.get_user_by_username(sample_user.username)
-        
-        assert found_user is not None
-        assert found_user.id == sample_user.id
-        assert found_user.username == sample_user.username
+    def test_create_user_not_null_failure_is_not_a_duplicate(self, test_session: Session):
+        """Test a NOT NULL failure on a unique column surfaces as DatabaseError, not a conflict."""
+        # Skip validation so the NOT NULL constraint on email is what rejects the row
+        user_data = UserCreate.model_construct(supertokens_user_id="st-user-789", email=None, username="nullemail")
 
-    def test_get_user_by_username_not_found(self, test_session: Session):
-        """Test getting user by non-existent username."""
-        auth_service = AuthService(test_session)
-        
-        found_user = auth_service.get_user_by_username("non-existent-user")
-        
-        assert found_user is None
+        with pytest.raises(DatabaseError):
+            UserService(test_session).create_user(user_data)
+
+    @pytest.mark.parametrize("attr, field", [
+        ("get_user_by_supertokens_id", "supertokens_user_id"),
+        ("get_user_by_username", "username"),
+        ("get_user_by_email", "email"),
+    ])
+    def test_get_user_by(self, auth_service: AuthService, sample_user, attr, field):
+        """Test getting a user by each lookup key."""
+        found_user = getattr(auth_service, attr)(getattr(sample_user, field))
 
-    def test_get_user_by_email(self, test_session: Session, sample_user):
-        """Test getting user by email."""
-        auth_service = AuthService(test_session)
-        
-        found_user = auth_service.get_user_by_email(sample_user.email)
-        
         assert found_user is not None
         assert found_user.id == sample_user.id
-        assert found_user.email == sample_user.email
+        assert getattr(found_user, field) == getattr(sample_user, field)
 
-    def test_get_user_by_email_not_found(self, test_session: Session):
-        """Test getting user by non-existent email."""
-        auth_service = AuthService(test_session)
-        
-        found_user = auth_service.get_user_by_email("non-existent@example.com")
-        
-        assert found_user is None
+    @pytest.mark.parametrize("attr, value", [
+        ("get_user_by_supertokens_id", "non-existent-id"),
+        ("get_user_by_username", "non-existent-user"),
+        ("get_user_by_email", "non-existent@example.com"),
+    ])
+    def test_get_user_not_found(self, auth_service: AuthService, attr, value):
+        """Test getting a user by a non-existent lookup key."""
+        assert getattr(auth_service, attr)(value) is None
+
+    def test_get_user_by_supertokens_id_request_cache(self, test_session: Session, sample_user, mocker):
+        """Test repeated lookups within one request hit the database once."""
+        request = mocker.MagicMock()
+        request.state = State()
+        lookup = mocker.spy(UserService, "get_user_by_supertokens_id")
 
-    def test_is_username_available_true(self, test_session: Session):
+        first = AuthService(test_session, request).get_user_by_supertokens_id(sample_user.supertokens_user_id)
+        second = AuthService(test_session, request).get_user_by_supertokens_id(sample_user.supertokens_user_id)
+
+        assert first is second
+        assert lookup.call_count == 1
+
+    def test_is_username_available_true(self, auth_service: AuthService):
         """Test username availability check when available."""
-        auth_service = AuthService(test_session)
-        
         is_available = auth_service.is_username_available("available-username")
         
         assert is_available is True
 
-    def test_is_username_available_false(self, test_session: Session, sample_user):
+    def test_is_username_available_false(self, auth_service: AuthService, sample_user):
         """Test username availability check when taken."""
-        auth_service = AuthService(test_session)
-        
         is_available = auth_service.is_username_available(sample_user.username)
         
         assert is_available is False
 
+    def test_is_username_available_uses_indexed_exists(self, auth_service: AuthService, query_counter):
+        """Test the availability check is a single EXISTS probe on an indexed column."""
+        query_counter.reset()
+
+        auth_service.is_username_available("available-username")
+
+        assert len(query_counter.statements) == 1
+        assert query_counter.statements[0].lstrip().upper().startswith("SELECT EXISTS")
+        # Inspect through the session's connection so the test transaction stays open
+        indexes = inspect(auth_service.db.connection()).get_indexes("user")
+        indexed_columns = {column for index in indexes for column in index["column_names"]}
+        assert "username" in indexed_columns
+
     @pytest.mark.asyncio
-    async def test_signup_user_success(self, test_session: Session, mock_supertokens_signup):
+    async def test_signup_user_success(self, auth_service: AuthService, mock_supertokens_signup):
         """Test successful user signup."""
-        auth_service = AuthService(test_session)
-
         user = await auth_service.signup_user(
             email="newuser@example.com",
             password="password123",
@@ -127,10 +154,8 @@ class TestAuthService:
         assert user.supertokens_user_id == "test-st-user-id-123"
 
     @pytest.mark.asyncio
-    async def test_signup_user_username_taken(self, test_session: Session, sample_user):
+    async def test_signup_user_username_taken(self, auth_service: AuthService, sample_user):
         """Test user signup with taken username."""
-        auth_service = AuthService(test_session)
-
         with pytest.raises(UsernameTakenError) as exc_info:
             await auth_service.signup_user(
                 email="different@example.com",
@@ -143,10 +168,20 @@ class TestAuthService:
         assert sample_user.username in str(exc_info.value)
 
     @pytest.mark.asyncio
-    async def test_signin_user_success(self, test_session: Session, sample_user, mock_supertokens_signin):
-        """Test successful user signin."""
-        auth_service = AuthService(test_session)
+    async def test_signup_user_email_taken(self, auth_service: AuthService, sample_user):
+        """Test user signup with an already registered email."""
+        with pytest.raises(EmailAlreadyRegisteredError) as exc_info:
+            await auth_service.signup_user(
+                email=sample_user.email,
+                password="password123",
+                username="differentuser",
+            )
 
+        assert exc_info.value.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_signin_user_success(self, auth_service: AuthService, sample_user, mock_supertokens_signin):
+        """Test successful user signin."""
         user = await auth_service.signin_user(
             email=sample_user.email,
             password="password123"
@@ -156,10 +191,8 @@ class TestAuthService:
         assert user.id == sample_user.id
 
     @pytest.mark.asyncio
-    async def test_signin_user_not_found(self, test_session: Session, mock_supertokens_signin):
+    async def test_signin_user_not_found(self, auth_service: AuthService, mock_supertokens_signin):
         """Test user signin when user not found in our database."""
-        auth_service = AuthService(test_session)
-
         with pytest.raises(UserProfileNotFoundError) as exc_info:
             await auth_service.signin_user(
                 email="notfound@example.com",
@@ -169,6 +202,49 @@ class TestAuthService:
         assert exc_info.value.status_code == 404
         assert "User profile not found" in str(exc_info.value)
 
+    def test_get_or_create_user_picks_free_username(self, test_session: Session, auth_service: AuthService):
+        """Test username derivation skips taken numbered variants."""
+        for i, username in enumerate(["anime", "anime1", "anime2", "anime_fan"]):
+            test_session.add(User(
+                supertokens_user_id=f"st-existing-{i}",
+                email=f"existing{i}@example.com",
+                username=username,
+            ))
+        test_session.commit()
+        user = auth_service.get_or_create_user_from_supertokens("st-new-user", "anime@example.com")
+
+        assert user.username == "anime3"
+        assert auth_service.get_or_create_user_from_supertokens("st-new-user", "anime@example.com").id == user.id
+
+    def test_available_username_ignores_lookalike_usernames(self, test_session: Session, auth_service: AuthService):
+        """Test only the base followed by a short run of digits counts as a numbered variant."""
+        for i, username in enumerate(["j.doe", "j.doe2", "jxdoe7", "j.doe99999999999", "j.doe2b"]):
+            test_session.add(User(
+                supertokens_user_id=f"st-existing-{i}",
+                email=f"existing{i}@example.com",
+                username=username,
+            ))
+        test_session.commit()
+
+        assert auth_service.user_service.get_available_username("j.doe") == "j.doe3"
+
+    def test_deactivate_and_reactivate_user(self, test_session: Session, auth_service: AuthService, sample_user, query_counter):
+        """Test toggling a user's active state with one UPDATE each."""
+        query_counter.reset()
+        auth_service.deactivate_user(sample_user)
+        assert sample_user.is_active is False
+        assert query_counter.count == 1
+        test_session.refresh(sample_user)
+        assert sample_user.is_active is False
+
+        query_counter.reset()
+        auth_service.reactivate_user(sample_user)
+        assert sample_user.is_active is True
+        assert query_counter.count == 1
+
+        test_session.refresh(sample_user)
+        assert sample_user.is_active is True
+
     def test_multiple_users_creation(self, test_session: Session):
         """Test creating multiple users."""
         users_data = [
@@ -181,24 +257,22 @@ class TestAuthService:
             for i in range(5)
         ]
         
-        created_users = []
-        for user_data in users_data:
-            user = User(**user_data)
-            test_session.add(user)
-            created_users.append(user)
-        
+        test_session.add_all([User(**user_data) for user_data in users_data])
         test_session.commit()
         
-        for i, user in enumerate(created_users):
-            test_session.refresh(user)
-            assert user.id is not None
-            assert user.username == f"user{i}"
-            assert user.email == f"user{i}@example.com"
+        # Read back what was stored in one query instead of refreshing each user
+        stored = test_session.exec(
+            select(User.id, User.username, User.email)
+            .where(User.username.in_([user_data["username"] for user_data in users_data]))
+            .order_by(User.username)
+        ).all()
+        assert all(user_id is not None for user_id, _, _ in stored)
+        assert [(username, email) for _, username, email in stored] == [
+            (f"user{i}", f"user{i}@example.com") for i in range(5)
+        ]
 
-    def test_case_insensitive_operations(self, test_session: Session):
+    def test_case_insensitive_operations(self, test_session: Session, auth_service: AuthService):
         """Test case handling in username and email operations."""
-        auth_service = AuthService(test_session)
-        
         # Create user with lowercase email and username
         user = User(
             supertokens_user_id="test-case-user",
@@ -0,0 +1,56 @@
+"""
+Unit tests for the in-memory rate limiter.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import src.rate_limit as rate_limit
+from src.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the limiter's clock so windows can be crossed without sleeping."""
+    fake_clock = SimpleNamespace(now=1_700_000_000.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: fake_clock.now))
+    return fake_clock
+
+
+@pytest.fixture
+def limiter(monkeypatch, clock) -> RateLimiter:
+    """In-memory rate limiter, regardless of whether redis is installed."""
+    monkeypatch.setattr(rate_limit, "REDIS_AVAILABLE", False)
+    return RateLimiter()
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Test the in-memory rate limiting window."""
+
+    def test_blocks_requests_over_limit_within_window(self, limiter: RateLimiter):
+        """Test requests past the limit are rejected inside one window."""
+        results = [limiter.is_allowed("user:1", limit=10, window=60) for _ in range(15)]
+
+        assert results == [True] * 10 + [False] * 5
+
+    def test_allows_requests_again_after_window(self, limiter: RateLimiter, clock):
+        """Test the limit resets once the window has passed."""
+        for _ in range(10):
+            limiter.is_allowed("user:1", limit=10, window=60)
+        assert not limiter.is_allowed("user:1", limit=10, window=60)
+
+        clock.now += 61
+
+        assert limiter.is_allowed("user:1", limit=10, window=60)
+
+    def test_remaining_requests_follow_window(self, limiter: RateLimiter, clock):
+        """Test remaining requests drop with use and recover after the window."""
+        for _ in range(3):
+            limiter.is_allowed("user:1", limit=5, window=60)
+        assert limiter.get_remaining_requests("user:1", limit=5, window=60) == 2
+
+        clock.now += 61
+
+        assert limiter.get_remaining_requests("user:1", limit=5, window=60) == 5
@@ -0,0 +1,45 @@
+"""
+Unit tests for request schema validation.
+
+These cover validation-only cases directly against the models the routes
+accept; the HTTP 422 mapping itself is exercised by the integration tests.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from src.models import UserUpdate
+from src.schemas import UserLoginRequest, UserSignupRequest
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestRequestSchemas:
+    """Test request schemas reject invalid payloads."""
+
+    def test_signup_invalid_data(self):
+        """Test signup rejects malformed email, password and username."""
+        with pytest.raises(ValidationError):
+            UserSignupRequest.model_validate({
+                "email": "invalid-email",  # Invalid email format
+                "password": "123",  # Too short
+                "username": "ab",  # Too short
+            })
+
+    def test_signup_missing_fields(self):
+        """Test signup requires password and username."""
+        with pytest.raises(ValidationError):
+            UserSignupRequest.model_validate({"email": "test@example.com"})
+
+    def test_signin_missing_fields(self):
+        """Test signin requires a password."""
+        with pytest.raises(ValidationError):
+            UserLoginRequest.model_validate({"email": "test@example.com"})
+
+    def test_update_profile_with_invalid_data(self):
+        """Test profile updates reject short usernames and non-boolean flags."""
+        with pytest.raises(ValidationError):
+            UserUpdate.model_validate({
+                "username": "ab",  # Too short
+                "is_active": "not-a-boolean",  # Invalid type
+            })
@@ -0,0 +1,32 @@
+"""
+Unit tests for the transactional test_session fixture.
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from src.models import User
+from tests.factories import UserFactory
+
+ISOLATION_USERNAME = "isolation-probe"
+
+
+@pytest.mark.unit
+# Both tests must run on one worker for the leak check to observe the first one
+@pytest.mark.xdist_group(name="session-isolation")
+class TestSessionIsolation:
+    """Test commits stay inside the per-test outer transaction."""
+
+    def test_commit_survives_in_test_rollback(self, test_session: Session):
+        """Test a commit releases its SAVEPOINT, so a later rollback keeps the row."""
+        test_session.add(UserFactory(username=ISOLATION_USERNAME))
+        test_session.commit()
+        test_session.rollback()
+
+        statement = select(User).where(User.username == ISOLATION_USERNAME)
+        assert test_session.exec(statement).first() is not None
+
+    def test_committed_rows_do_not_leak_between_tests(self, test_session: Session):
+        """Test rows committed by the previous test were rolled back at teardown."""
+        statement = select(User).where(User.username == ISOLATION_USERNAME)
+        assert test_session.exec(statement).first() is None
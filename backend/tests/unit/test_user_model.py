@@ -2,21 +2,13 @@
 Unit tests for User model.
 """
 
-import sys
 from datetime import datetime
-from pathlib import Path
 
 import pytest
 from sqlmodel import Session
 
-# Add the src directory to the Python path
-backend_path = Path(__file__).parent.parent.parent
-src_path = backend_path / "src"
-sys.path.insert(0, str(backend_path))
-sys.path.insert(0, str(src_path))
-
-import src.models as models  # noqa: E402
-from tests.factories import UserFactory  # noqa: E402
+import src.models as models
+from tests.factories import UserFactory
 
 
 @pytest.mark.unit
@@ -4,6 +4,7 @@ Unit tests for WatchlistItem model.
 
 import pytest
 from datetime import datetime
+from sqlalchemy import text
 from sqlmodel import Session
 from pydantic import ValidationError
 
@@ -85,30 +86,17 @@ class TestWatchlistItemModel:
         assert item_update.status == "completed"
         assert item_update.notes is None
 
-    def test_anime_score_constraints(self):
-        """Test anime score validation constraints."""
-        # Test valid scores
-        valid_item = WatchlistItemCreate(
-            anime_id=1,
-            anime_title="Test",
-            anime_score=8.5
-        )
-        assert valid_item.anime_score == 8.5
-        
-        # Test boundary values
-        min_score = WatchlistItemCreate(
-            anime_id=1,
-            anime_title="Test",
-            anime_score=0.0
-        )
-        assert min_score.anime_score == 0.0
-        
-        max_score = WatchlistItemCreate(
-            anime_id=1,
-            anime_title="Test",
-            anime_score=10.0
-        )
-        assert max_score.anime_score == 10.0
+    @pytest.mark.parametrize("score", [0.0, 8.5, 10.0])
+    def test_anime_score_constraints_valid(self, score):
+        """Test anime scores within 0.0-10.0 are accepted."""
+        item = WatchlistItemCreate(anime_id=1, anime_title="Test", anime_score=score)
+        assert item.anime_score == score
+
+    @pytest.mark.parametrize("score", [-1e6, -0.1, 10.1, 1e6])
+    def test_anime_score_constraints_invalid(self, score):
+        """Test anime scores outside 0.0-10.0 are rejected."""
+        with pytest.raises(ValidationError):
+            WatchlistItemCreate(anime_id=1, anime_title="Test", anime_score=score)
 
     def test_required_fields(self):
         """Test that required fields are enforced."""
@@ -142,29 +130,40 @@ class TestWatchlistItemModel:
         assert item.anime_score is None
         assert item.notes is None
 
-    def test_notes_length_constraint(self):
-        """Test notes field length constraint."""
-        long_notes = "x" * 1001  # Exceeds max length
-        
-        # This should raise a validation error
+    @pytest.mark.parametrize("length", [1, 1000])
+    def test_notes_length_constraint_valid(self, length):
+        """Test notes up to 1000 characters are accepted."""
+        notes = "x" * length
+        assert WatchlistItemCreate(anime_id=123, anime_title="Test Anime", notes=notes).notes == notes
+
+    @pytest.mark.parametrize("length", [1001, 5000])
+    def test_notes_length_constraint_invalid(self, length):
+        """Test notes over 1000 characters are rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            WatchlistItemCreate(
-                anime_id=123,
-                anime_title="Test Anime",
-                notes=long_notes
-            )
-        
+            WatchlistItemCreate(anime_id=123, anime_title="Test Anime", notes="x" * length)
         assert "String should have at most 1000 characters" in str(exc_info.value)
 
-    def test_anime_title_length_constraint(self):
-        """Test anime title length constraint."""
-        long_title = "x" * 201  # Exceeds max length
-        
-        # This should raise a validation error
+    @pytest.mark.parametrize("length", [1, 200])
+    def test_anime_title_length_constraint_valid(self, length):
+        """Test anime titles up to 200 characters are accepted."""
+        title = "x" * length
+        assert WatchlistItemCreate(anime_id=123, anime_title=title).anime_title == title
+
+    @pytest.mark.parametrize("length", [201, 500])
+    def test_anime_title_length_constraint_invalid(self, length):
+        """Test anime titles over 200 characters are rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            WatchlistItemCreate(
-                anime_id=123,
-                anime_title=long_title
-            )
-        
+            WatchlistItemCreate(anime_id=123, anime_title="x" * length)
         assert "String should have at most 200 characters" in str(exc_info.value)
+
+    @pytest.mark.parametrize("query, index_name", [
+        ("SELECT * FROM watchlistitem WHERE user_id = 1 AND anime_id = 1", "ix_watchlist_user_anime"),
+        ("SELECT status, COUNT(id) FROM watchlistitem WHERE user_id = 1 GROUP BY status", "ix_watchlist_user_status"),
+    ])
+    def test_user_scoped_lookups_use_composite_index(self, test_session: Session, query, index_name):
+        """Test hot per-user lookups are index seeks rather than table scans."""
+        plan = test_session.exec(text(f"EXPLAIN QUERY PLAN {query}")).all()
+
+        details = " ".join(row[-1] for row in plan)
+        assert index_name in details
+        assert "SCAN watchlistitem" not in details
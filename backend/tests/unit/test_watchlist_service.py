@@ -0,0 +1,193 @@
+"""
+Unit tests for WatchlistService.
+"""
+
+import pytest
+from sqlmodel import Session
+
+from src.cache import watchlist_stats_cache_key, watchlist_stats_version_key
+from src.exceptions import DatabaseError, DuplicateWatchlistItemError, WatchlistItemNotFoundError
+from src.models import WatchlistItemCreate, WatchlistItemUpdate
+from src.services import watchlist_service
+from src.services.watchlist_service import WatchlistService
+from tests.factories import seed_watchlist
+
+
+@pytest.mark.unit
+@pytest.mark.watchlist
+class TestWatchlistService:
+    """Test the WatchlistService class."""
+
+    def test_bulk_add_to_watchlist(self, test_session: Session, sample_user):
+        """Test adding several anime in one call."""
+        watchlist_service = WatchlistService(test_session)
+        items_data = [
+            WatchlistItemCreate(anime_id=100 + i, anime_title=f"Bulk Anime {i}", status="watching")
+            for i in range(3)
+        ]
+
+        created = watchlist_service.bulk_add_to_watchlist(sample_user, items_data)
+
+        assert [item.anime_id for item in created] == [100, 101, 102]
+        assert all(item.id is not None for item in created)
+        assert all(item.user_id == sample_user.id for item in created)
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"watching": 3}
+
+    def test_bulk_add_to_watchlist_skips_existing(self, test_session: Session, sample_user, sample_watchlist_item):
+        """Test anime already on the watchlist are skipped rather than failing the batch."""
+        watchlist_service = WatchlistService(test_session)
+        items_data = [
+            WatchlistItemCreate(anime_id=sample_watchlist_item.anime_id, anime_title="Duplicate"),
+            WatchlistItemCreate(anime_id=200, anime_title="New Anime"),
+        ]
+
+        created = watchlist_service.bulk_add_to_watchlist(sample_user, items_data)
+
+        assert [item.anime_id for item in created] == [200]
+
+    def test_bulk_add_to_watchlist_chunks_statements(self, test_session: Session, sample_user, monkeypatch):
+        """Test large batches are split across several INSERT statements."""
+        monkeypatch.setattr(watchlist_service, "BULK_INSERT_CHUNK_SIZE", 2)
+        items_data = [
+            WatchlistItemCreate(anime_id=300 + i, anime_title=f"Chunked Anime {i}")
+            for i in range(5)
+        ]
+
+        created = WatchlistService(test_session).bulk_add_to_watchlist(sample_user, items_data)
+
+        assert len(created) == 5
+
+    def test_bulk_add_to_watchlist_without_conflict_clause(
+        self, test_session: Session, sample_user, sample_watchlist_item, monkeypatch
+    ):
+        """Test dialects without ON CONFLICT still skip anime already present."""
+        monkeypatch.delitem(watchlist_service._CONFLICT_AWARE_INSERTS, "sqlite")
+        items_data = [
+            WatchlistItemCreate(anime_id=sample_watchlist_item.anime_id, anime_title="Duplicate"),
+            WatchlistItemCreate(anime_id=500, anime_title="New Anime"),
+            WatchlistItemCreate(anime_id=500, anime_title="New Anime Again"),
+        ]
+
+        created = WatchlistService(test_session).bulk_add_to_watchlist(sample_user, items_data)
+
+        assert [(item.anime_id, item.anime_title) for item in created] == [(500, "New Anime")]
+        assert all(item.id is not None for item in created)
+
+    def test_bulk_add_to_watchlist_empty(self, test_session: Session, sample_user):
+        """Test an empty batch is a no-op."""
+        assert WatchlistService(test_session).bulk_add_to_watchlist(sample_user, []) == []
+
+    def test_add_to_watchlist_returns_stored_row(self, test_session: Session, sample_user):
+        """Test the added item comes back with its generated id and timestamps."""
+        item = WatchlistService(test_session).add_to_watchlist(
+            sample_user, WatchlistItemCreate(anime_id=400, anime_title="Returned Anime")
+        )
+
+        assert item.id is not None
+        assert item.user_id == sample_user.id
+        assert item.created_at is not None
+
+    def test_add_to_watchlist_duplicate(self, test_session: Session, sample_user, sample_watchlist_item):
+        """Test adding an anime already on the watchlist raises DuplicateWatchlistItemError."""
+        with pytest.raises(DuplicateWatchlistItemError):
+            WatchlistService(test_session).add_to_watchlist(
+                sample_user, WatchlistItemCreate(anime_id=sample_watchlist_item.anime_id, anime_title="Again")
+            )
+
+    def test_add_to_watchlist_other_integrity_error(self, test_session: Session, sample_user):
+        """Test constraint failures other than the duplicate index surface as DatabaseError."""
+        # Skip validation so the NOT NULL constraint on anime_title is what rejects the row
+        item_data = WatchlistItemCreate.model_construct(anime_id=401, anime_title=None)
+
+        with pytest.raises(DatabaseError):
+            WatchlistService(test_session).add_to_watchlist(sample_user, item_data)
+
+    def test_update_watchlist_item_bumps_updated_at(self, test_session: Session, sample_user, sample_watchlist_item):
+        """Test updating an item refreshes its updated_at timestamp."""
+        previous_updated_at = sample_watchlist_item.updated_at
+
+        item = WatchlistService(test_session).update_watchlist_item(
+            sample_user.id, sample_watchlist_item.id, WatchlistItemUpdate(notes="Rewatching")
+        )
+
+        assert item.notes == "Rewatching"
+        assert item.updated_at.replace(tzinfo=None) > previous_updated_at.replace(tzinfo=None)
+
+    def test_update_watchlist_item_not_found(self, test_session: Session, sample_user):
+        """Test updating a missing item raises WatchlistItemNotFoundError."""
+        with pytest.raises(WatchlistItemNotFoundError):
+            WatchlistService(test_session).update_watchlist_item(
+                sample_user.id, 99999, WatchlistItemUpdate(notes="Missing")
+            )
+
+    def test_bulk_update_status_not_found(self, test_session: Session, sample_user, shared_cache, mocker):
+        """Test a bulk update matching no items reports the ids and leaves the cache alone."""
+        watchlist_service = WatchlistService(test_session)
+        commit_spy = mocker.spy(test_session, "commit")
+        set_spy = mocker.spy(watchlist_service.cache, "set")
+
+        with pytest.raises(WatchlistItemNotFoundError) as exc_info:
+            watchlist_service.bulk_update_status(sample_user.id, [99998, 99999], "completed")
+
+        assert exc_info.value.details["item_ids"] == [99998, 99999]
+        assert commit_spy.call_count == 0
+        assert set_spy.call_count == 0
+
+    def test_status_counts_are_cached_until_a_write(self, test_session: Session, sample_user, sample_watchlist_item, shared_cache, mocker):
+        """Test status counts are served from a shared cache and invalidated by writes."""
+        watchlist_service = WatchlistService(test_session)
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"watching": 1}
+
+        exec_spy = mocker.spy(test_session, "exec")
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"watching": 1}
+        assert exec_spy.call_count == 0
+
+        watchlist_service.update_watchlist_item(
+            sample_user.id, sample_watchlist_item.id, WatchlistItemUpdate(status="completed")
+        )
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"completed": 1}
+
+    def test_status_counts_written_back_after_a_write_are_ignored(
+        self, test_session: Session, sample_user, sample_watchlist_item, shared_cache
+    ):
+        """Test counts a reader caches under the pre-write version are never served."""
+        watchlist_service = WatchlistService(test_session)
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"watching": 1}
+        stale_version = watchlist_service.cache.get(watchlist_stats_version_key(sample_user.id))
+
+        watchlist_service.update_watchlist_item(
+            sample_user.id, sample_watchlist_item.id, WatchlistItemUpdate(status="completed")
+        )
+
+        # A reader that queried before the commit stores its stale counts late
+        watchlist_service.cache.set(watchlist_stats_cache_key(sample_user.id, stale_version), {"watching": 1})
+
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"completed": 1}
+
+    def test_status_counts_are_not_cached_in_process_memory(
+        self, test_session: Session, sample_user, sample_watchlist_item, mocker
+    ):
+        """Test the per-process memory cache never serves status counts."""
+        watchlist_service = WatchlistService(test_session)
+        watchlist_service.get_watchlist_status_counts(sample_user.id)
+
+        exec_spy = mocker.spy(test_session, "exec")
+        assert watchlist_service.get_watchlist_status_counts(sample_user.id) == {"watching": 1}
+        assert exec_spy.call_count == 1
+
+    def test_seed_watchlist_helper(self, test_session: Session, sample_user):
+        """Test the bulk seeding helper inserts the requested number of rows."""
+        seed_watchlist(test_session, sample_user, 25, status="completed")
+
+        assert WatchlistService(test_session).get_watchlist_status_counts(sample_user.id) == {"completed": 25}
+
+    def test_seed_watchlist_helper_avoids_existing_anime_ids(self, test_session: Session, sample_user, sample_watchlist_item):
+        """Test seeded rows never reuse an anime_id the user already has."""
+        seed_watchlist(test_session, sample_user, 3)
+        seed_watchlist(test_session, sample_user, 3)
+
+        watchlist = WatchlistService(test_session).get_watchlist(sample_user.id, limit=10)
+        anime_ids = [item.anime_id for item in watchlist["items"]]
+        assert watchlist["total_count"] == 7
+        assert len(set(anime_ids)) == 7
+        assert sample_watchlist_item.anime_id in anime_ids